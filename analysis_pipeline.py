@@ -0,0 +1,81 @@
+import queue
+import threading
+
+# Put on a stage's input queue to tell one of its workers there is nothing more to come
+_DONE = object()
+
+
+class PipelineStage:
+    """One step of a StagedPipeline: a function run by its own pool of worker threads"""
+
+    def __init__(self, name, function, workers=1, queue_size=None):
+        self.name = name
+        self.function = function  # item -> next item, or None to drop it
+        self.workers = workers
+        # A full input queue blocks the stage before, so a slow stage holds back the ones feeding it
+        self.queue_size = queue_size if queue_size is not None else 2 * workers
+
+
+class StagedPipeline:
+    """Pass items through a chain of stages that all run at the same time.
+
+    Each item moves to the next stage as soon as it leaves the current one,
+    so a symbol whose data arrives early is analysed while others are still
+    being fetched. Stages are joined by bounded queues for backpressure.
+    """
+
+    def __init__(self, stages):
+        self.stages = stages
+
+    def run(self, items):
+        """Feed items through every stage and return what comes out of the last one"""
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        results = []
+        results_lock = threading.Lock()
+        threads = []
+
+        for index, stage in enumerate(self.stages):
+            output = queues[index + 1] if index + 1 < len(queues) else None
+            next_workers = self.stages[index + 1].workers if output is not None else 0
+            # The last worker of a stage to finish passes the end marker on to the next stage
+            remaining = [stage.workers]
+            remaining_lock = threading.Lock()
+
+            def work(stage=stage, input_queue=queues[index], output=output, next_workers=next_workers,
+                     remaining=remaining, remaining_lock=remaining_lock):
+                while True:
+                    item = input_queue.get()
+                    if item is _DONE:
+                        break
+                    try:
+                        result = stage.function(item)
+                    except Exception as e:
+                        print(f"Error in {stage.name} stage: {str(e)}")
+                        continue
+                    if result is None:
+                        continue
+                    if output is not None:
+                        output.put(result)
+                    else:
+                        with results_lock:
+                            results.append(result)
+                with remaining_lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last and output is not None:
+                    for _ in range(next_workers):
+                        output.put(_DONE)
+
+            for number in range(stage.workers):
+                thread = threading.Thread(target=work, name=f"pipeline-{stage.name}-{number}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        for item in items:
+            queues[0].put(item)
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+        return results
@@ -0,0 +1,126 @@
+import asyncio
+import random
+import time
+
+# Candle length of each supported timeframe, in seconds
+TIMEFRAME_SECONDS = {
+    '1m': 60,
+    '5m': 5 * 60,
+    '15m': 15 * 60,
+    '1h': 60 * 60,
+    '4h': 4 * 60 * 60,
+    '1d': 24 * 60 * 60
+}
+
+
+def next_candle_close(timestamp, timeframe):
+    """Time of the first candle close after timestamp (candles are aligned to UTC, like the exchanges)"""
+    period = TIMEFRAME_SECONDS[timeframe]
+    return (int(timestamp) // period + 1) * period
+
+
+class CandleJob:
+    """A blocking function run after every candle close of one timeframe, with its run statistics"""
+
+    def __init__(self, name, timeframe, function, overlap='coalesce'):
+        if timeframe not in TIMEFRAME_SECONDS:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        if overlap not in ('skip', 'coalesce'):
+            raise ValueError(f"Unknown overlap policy: {overlap}")
+        self.name = name
+        self.timeframe = timeframe
+        self.function = function
+        self.overlap = overlap  # What to do when a close arrives while the previous run is still going
+        self.task = None
+        self.pending_close = None  # Close waiting for the current run to finish (coalesce policy)
+        self.runs = 0
+        self.missed = 0  # Closes that got no run of their own
+        self.last_lag = None  # Seconds between a candle close and the start of its run
+        self.max_lag = 0.0
+        self.last_duration = None
+
+
+class CandleScheduler:
+    """Run jobs on an asyncio loop shortly after each candle close of their timeframe.
+
+    Runs start close_delay seconds after the close, plus up to jitter seconds
+    so jobs sharing a close don't all hit the APIs at the same instant. Job
+    functions are blocking and run in a worker thread.
+    """
+
+    def __init__(self, close_delay=2.0, jitter=3.0):
+        self.close_delay = close_delay  # Give the exchange time to publish the closed bar
+        self.jitter = jitter
+        self.jobs = []
+
+    def add_job(self, name, timeframe, function, overlap='coalesce'):
+        job = CandleJob(name, timeframe, function, overlap)
+        self.jobs.append(job)
+        return job
+
+    async def run(self):
+        """Run every job's schedule until cancelled"""
+        await asyncio.gather(*(self._schedule(job) for job in self.jobs))
+
+    async def _schedule(self, job):
+        period = TIMEFRAME_SECONDS[job.timeframe]
+        close = next_candle_close(time.time(), job.timeframe)
+        while True:
+            fire_at = close + self.close_delay + random.uniform(0, self.jitter)
+            await asyncio.sleep(max(fire_at - time.time(), 0))
+
+            # Closes that went by while the loop was held up (e.g. the machine slept) are not replayed
+            passed = int((time.time() - self.close_delay - close) // period)
+            if passed > 0:
+                job.missed += passed
+                print(f"{job.name}: missed {passed} candle close(s)")
+                close += passed * period
+
+            self._trigger(job, close)
+            close += period
+
+    def _trigger(self, job, close):
+        if job.task is not None and not job.task.done():
+            if job.overlap == 'skip':
+                job.missed += 1
+                print(f"{job.name}: previous run still going, skipping the {self._format_close(close)} close")
+                return
+            # Only the newest waiting close is run once the current run finishes
+            if job.pending_close is not None:
+                job.missed += 1
+                print(f"{job.name}: previous run still going, folding the {self._format_close(job.pending_close)} close into the next run")
+            job.pending_close = close
+            return
+        job.task = asyncio.create_task(self._run(job, close))
+
+    async def _run(self, job, close):
+        while close is not None:
+            started = time.time()
+            job.last_lag = started - close
+            job.max_lag = max(job.max_lag, job.last_lag)
+            try:
+                await asyncio.to_thread(job.function)
+            except Exception as e:
+                print(f"Error in scheduled job {job.name}: {str(e)}")
+            job.runs += 1
+            job.last_duration = time.time() - started
+            print(f"{job.name}: started {job.last_lag:.1f}s after the {self._format_close(close)} close, "
+                  f"took {job.last_duration:.1f}s (runs: {job.runs}, missed: {job.missed}, max lag: {job.max_lag:.1f}s)")
+            close, job.pending_close = job.pending_close, None
+
+    @staticmethod
+    def _format_close(close):
+        return time.strftime('%Y-%m-%d %H:%M', time.localtime(close))
+
+    def stats(self):
+        """Run statistics per job name"""
+        return {
+            job.name: {
+                'runs': job.runs,
+                'missed': job.missed,
+                'last_lag': job.last_lag,
+                'max_lag': job.max_lag,
+                'last_duration': job.last_duration
+            }
+            for job in self.jobs
+        }
@@ -25,6 +25,20 @@ SYMBOLS = [
     'MATICUSDT' # Polygon
 ]
 
+# Coin names used alongside the ticker when searching and routing news
+COIN_NAMES = {
+    'BTCUSDT': 'Bitcoin',
+    'ETHUSDT': 'Ethereum',
+    'XRPUSDT': 'Ripple',
+    'HBARUSDT': 'Hedera',
+    'BNBUSDT': 'Binance Coin',
+    'ADAUSDT': 'Cardano',
+    'DOGEUSDT': 'Dogecoin',
+    'SOLUSDT': 'Solana',
+    'DOTUSDT': 'Polkadot',
+    'MATICUSDT': 'Polygon'
+}
+
 TIMEFRAMES = ['1m', '5m', '15m', '1h', '4h', '1d']
 SIGNAL_THRESHOLD = 0.7  # Minimum confidence score for buy signals
 
@@ -40,9 +54,47 @@ BOLLINGER_STD = 2
 
 # News Analysis Parameters
 NEWS_LOOKBACK_HOURS = 24
+NEWS_CACHE_TTL = 900  # Reuse fetched news for 15 minutes before querying NewsAPI again
+NEWS_QUERY_MAX_LENGTH = 500  # NewsAPI limit on the length of the q parameter
+NEWS_MAX_REQUESTS_PER_QUERY = 5  # Requests of 100 articles each a combined query may take to return everything
+TWITTER_WINDOW_SIZE = 200  # Scored tweets kept per symbol
+TWITTER_STATE_FILE = 'twitter_state.json'  # since_id cursors and tweet windows kept across restarts
 SENTIMENT_THRESHOLD = 0.6  # Minimum sentiment score to consider news positive
+NEWS_DEDUP_MAX_FINGERPRINTS = 5000  # Near-duplicate story fingerprints kept across cycles
+NEWS_DEDUP_MAX_DISTANCE = 8  # Max differing SimHash bits for two stories to count as the same
 SIGNAL_INTERVAL = 300  # 5 minutes in seconds
 
+# Analysis Pipeline
+PIPELINE_FETCH_WORKERS = 4  # Symbols whose data is fetched at the same time
+PIPELINE_ANALYSIS_WORKERS = 2  # Threads running technical and sentiment analysis
+PIPELINE_QUEUE_SIZE = 4  # Fetched symbols that may wait for analysis before fetching pauses
+ANALYSIS_PROCESSES = int(os.getenv('ANALYSIS_PROCESSES', '0'))  # Worker processes sharing the symbols for analysis, 0 analyses in threads
+
+# Scheduling
+ANALYSIS_TIMEFRAMES = ['1h']  # An analysis run starts after every candle close of each of these
+SCHEDULE_CLOSE_DELAY = 2  # Seconds after a close before running, so the closed bar is published
+SCHEDULE_JITTER = 3  # Up to this many extra seconds, spreading runs that share a close
+SCHEDULE_OVERLAP = 'coalesce'  # 'coalesce' runs once more after an overrunning cycle, 'skip' drops the close
+
+# Event-driven Analysis (python main.py watch)
+PRICE_WATCH_TIMEFRAME = '1h'  # A symbol is also re-analysed after each close of this candle
+PRICE_WATCH_INTERVAL = 15  # Seconds between price checks, one request covers every symbol
+PRICE_MOVE_THRESHOLD = 0.02  # Re-analyse a symbol once its price is 2% away from its last analysis
+PRICE_TRIGGER_DEBOUNCE = 30  # Seconds a move has to hold before its analysis starts
+PRICE_TRIGGER_MIN_INTERVAL = 300  # Minimum seconds between two analyses of the same symbol
+PRICE_TRIGGER_CONCURRENCY = 2  # Triggered analyses running at the same time
+
+# Distributed Analysis (python main.py coordinator, python main.py worker as many times as needed)
+# Task broker shared by the coordinator and workers. SQLite (WAL) is single-host only: every process on
+# one machine, with the file on a local disk
+BROKER_URL = os.getenv('BROKER_URL', 'sqlite:///analysis_tasks.db')
+BROKER_LEASE_SECONDS = 120  # A worker that hasn't finished a task in this long loses it to another worker
+BROKER_MAX_ATTEMPTS = 3  # Tries per symbol before its task is given up on
+BROKER_RETRY_DELAY = 5  # Seconds before retrying a failed task, times the attempts so far
+BROKER_POLL_INTERVAL = 1  # Seconds between checks for new tasks (workers) or results (coordinator)
+BROKER_CYCLE_TIMEOUT = 900  # Seconds the coordinator waits for a cycle's results
+BROKER_RETENTION_HOURS = 24  # Finished cycles are removed from the broker after this long
+
 # Risk Management
 MAX_POSITION_SIZE = 0.1  # Maximum 10% of portfolio per position
 STOP_LOSS_PERCENTAGE = 0.05  # 5% stop loss
@@ -13,11 +13,43 @@ from datetime import timedelta
 import asyncio
 import threading
 import queue
+import sys
+import argparse
+import subprocess
+import hashlib
+import heapq
+import itertools
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+from collections import OrderedDict
+from news_dedup import HeadlineDeduplicator
+from news_feeds import FeedReader
+from runtime_snapshot import RuntimeSnapshot
+from response_cache import ResponseCache
+from signal_history import SignalHistory
+from fx_rates import FxRateService
+from sent_news_store import SentNewsStore
+from subscriptions import SubscriptionStore, ALERT_TYPES
+from shard_ipc import SnapshotHub, SnapshotSubscriber
+from outbound_queue import OutboundScheduler, PRIORITY_BREAKING, PRIORITY_ALERT, PRIORITY_INSIGHT
 
 # --- CONFIG ---
 TOKEN = os.getenv('DISCORD_BOT_TOKEN', 'YOUR_DISCORD_BOT_TOKEN')  # Replace with your bot token or set as env var
 CHANNEL_ID = int(os.getenv('DISCORD_CHANNEL_ID', '123456789012345678'))  # Replace with your channel ID or set as env var
 
+# Sharded mode (python crypto_discord_bot.py --shards N): the launcher runs a hub that fetches
+# market data and news once, and starts shard processes with these set in their environment
+BOT_ROLE = os.getenv('BOT_ROLE', 'single')  # 'single' or 'shard'
+SHARD_COUNT = int(os.getenv('BOT_SHARD_COUNT', '1'))
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv('BOT_SHARD_IDS', '').split(',') if shard_id]
+HUB_PORT = int(os.getenv('BOT_HUB_PORT', '0'))
+HUB_KEY = bytes.fromhex(os.getenv('BOT_HUB_KEY', ''))
+SHARD_CHECK_SECONDS = 10  # How often the launcher checks its shard processes are still running
+SHARD_RESTART_DELAY = 30  # Minimum seconds between two starts of the same shard process
+MARKET_DATA_NOT_READY_MESSAGE = "Market data is still loading, please try again in a moment."
+
 # Supported cryptocurrencies
 SUPPORTED_COINS = ['BTC', 'XRP', 'HBAR']
 
@@ -34,6 +66,26 @@ technical_terms = {
 # Default USD to GBP conversion rate as fallback
 USD_TO_GBP_RATE = 0.78
 
+# Blocking HTTP helpers run on a small thread pool so a slow upstream can't stall the event loop
+HTTP_TIMEOUT = 5  # Seconds allowed for each upstream API request
+BLOCKING_POOL_SIZE = 4
+
+# How often the cached exchange rate table is refreshed
+FX_REFRESH_MINUTES = 60
+
+# How often the market cache warmer checks for expired snapshots
+MARKET_WARM_SECONDS = 30
+
+# Runtime state (market snapshots, news source bookkeeping, FX rates) saved so restarts start warm
+RUNTIME_SNAPSHOT_FILE = os.getenv('RUNTIME_SNAPSHOT_FILE', 'runtime_snapshot.json')
+RUNTIME_SNAPSHOT_MINUTES = 2  # How often the snapshot is written
+RUNTIME_SNAPSHOT_MAX_AGE_HOURS = 12  # Older snapshots are ignored entirely
+QUEUED_NEWS_MAX_AGE_MINUTES = 30  # Queued breaking news is only reposted after a short restart
+
+# Rendered /analysis, /predict and /news embeds are reused until the market state behind them changes
+RESPONSE_CACHE_MAX_ENTRIES = 256
+NEWS_RESPONSE_TTL = 300  # /news doesn't depend on market state, so it simply expires
+
 # High-impact entities that can move markets
 MARKET_MOVERS = [
     # Priority figures (high impact)
@@ -54,6 +106,9 @@ MARKET_MOVERS = [
     'whale', 'liquidation', 'delisting', 'listing', 'partnership'
 ]
 
+# One compiled pattern to cheaply reject headlines that mention no market mover
+MARKET_MOVER_PATTERN = re.compile('|'.join(re.escape(entity) for entity in MARKET_MOVERS), re.IGNORECASE)
+
 # News sources to monitor
 NEWS_SOURCES = [
     'https://cryptonews.com/',
@@ -63,6 +118,24 @@ NEWS_SOURCES = [
     'https://decrypt.co/'
 ]
 
+# RSS/Atom feed for each news source; sources without one fall back to scraping the homepage
+NEWS_FEEDS = {
+    'https://cryptonews.com/': 'https://cryptonews.com/news/feed/',
+    'https://cointelegraph.com/': 'https://cointelegraph.com/rss',
+    'https://www.coindesk.com/': 'https://www.coindesk.com/arc/outboundfeeds/rss/',
+    'https://bitcoin.com/news/': 'https://news.bitcoin.com/feed/',
+    'https://decrypt.co/': 'https://decrypt.co/feed'
+}
+NEWS_FEED_MAX_AGE_HOURS = 12  # Feed items older than this are not treated as breaking news
+NEWS_FEED_CHUNK_SIZE = 8192  # Bytes handed to the feed parser at a time
+
+# Queued breaking news is posted one story at a time at this interval
+BREAKING_NEWS_DRAIN_SECONDS = 15
+
+# News source fetching limits
+NEWS_FETCH_TIMEOUT = 10  # Seconds allowed for each source
+NEWS_FETCH_CONCURRENCY = 5  # Max sources fetched at the same time
+
 # Twitter/X accounts to monitor - modified to focus on Trump and crypto influencers
 TWITTER_ACCOUNTS = [
     # High priority
@@ -79,49 +152,116 @@ TWITTER_ACCOUNTS = [
     'APompliano', 'tyler', 'garyvee'
 ]
 
-# Add a set to track sent news hashes at the top (after imports)
-sent_news_hashes = set()
+# Headlines already alerted, kept on disk so restarts don't repost old news
+SENT_NEWS_FILE = os.getenv('SENT_NEWS_FILE', 'sent_news.log')
+SENT_NEWS_TTL_DAYS = 30
+SENT_NEWS_MAX_ENTRIES = 50000
+sent_news = SentNewsStore(SENT_NEWS_FILE, ttl_seconds=SENT_NEWS_TTL_DAYS * 24 * 3600, max_entries=SENT_NEWS_MAX_ENTRIES)
+
+# Which channels get which scheduled posts and coins
+SUBSCRIPTIONS_FILE = os.getenv('SUBSCRIPTIONS_FILE', 'subscriptions.json')
+subscriptions = SubscriptionStore(SUBSCRIPTIONS_FILE)
+
+# Trading signals stored by the analysis app (main.py), shown by /history
+SIGNALS_DATABASE_FILE = os.getenv('SIGNALS_DATABASE_FILE', 'trading_signals.db')
+HISTORY_LIMIT = 10  # Signals listed by /history
+signal_history = SignalHistory(SIGNALS_DATABASE_FILE)
+
+# Detected breaking news waiting to be posted, most important first
+breaking_news_queue = []
+breaking_news_sequence = itertools.count()
+
+# Recent headlines, so reworded copies of a story from other sources aren't re-alerted
+news_deduplicator = HeadlineDeduplicator()
+
+# Last seen item of every news feed, so each scan only parses what's new
+feed_reader = FeedReader(max_age_seconds=NEWS_FEED_MAX_AGE_HOURS * 3600)
+
+class MarketDataNotReady(Exception):
+    """A shard was asked for market data before the hub sent any"""
 
 # Market state dictionary to ensure consistent predictions across all bot functions
 # The state is determined based on real market data (price changes, volume)
 class MarketStateManager:
     def __init__(self):
         self.market_states = {}
-        self.last_update = 0
+        self.expires_at = {}  # symbol -> time its snapshot should be refreshed
+        self.versions = {}  # symbol -> counter bumped on every update, used to key cached responses
         self.update_interval = 300  # Update market state every 5 minutes
+        self.retry_interval = 30  # Retry a coin whose ticker couldn't be fetched this soon
+        self.expiry_jitter = 30  # Spread expiries so refreshes don't all land at once
+        # The warmer and cold-start lookups run on worker threads, so only one refreshes at a time
+        self.lock = threading.Lock()
         
     def get_state(self, symbol):
-        """Get current market state for a symbol, updating if needed"""
-        current_time = time.time()
-        
-        # Update states if data is stale
-        if current_time - self.last_update > self.update_interval:
-            self._update_all_states()
-            self.last_update = current_time
-            
-        # Return the current state or generate a new one if doesn't exist
+        """Get the latest market state snapshot for a symbol.
+
+        Snapshots are kept fresh by the warm_market_cache task; only a symbol
+        that has never been loaded is fetched here. Shards never fetch, they
+        wait for the hub's first market message instead.
+        """
         if symbol not in self.market_states:
-            self._update_symbol_state(symbol)
-            
+            if BOT_ROLE == 'shard':
+                raise MarketDataNotReady(symbol)
+            self.refresh([symbol])
         return self.market_states[symbol]
     
-    def _update_all_states(self):
-        """Update market states for all supported coins"""
-        for symbol in SUPPORTED_COINS:
-            self._update_symbol_state(symbol)
+    def refresh_due(self):
+        """Refresh every supported coin whose snapshot has expired"""
+        now = time.time()
+        due = [symbol for symbol in SUPPORTED_COINS if self.expires_at.get(symbol, 0) <= now]
+        if due:
+            self.refresh(due)
+        return due
+    
+    def refresh(self, symbols):
+        """Update market states for the given coins from one bulk ticker request"""
+        with self.lock:
+            tickers = self._fetch_24h_tickers(symbols)
+            gbp_rate = convert_usd_to_gbp(1.0)
+            for symbol in symbols:
+                ticker = tickers.get(symbol)
+                if ticker is None and symbol in self.market_states:
+                    # Keep serving the last good snapshot (and responses cached from it) until a retry works
+                    self.expires_at[symbol] = time.time() + self.retry_interval
+                    continue
+                self._update_symbol_state(symbol, ticker, gbp_rate)
+                self.mark_updated(symbol)
+                if ticker is None:
+                    # Only a placeholder state for a coin never loaded, so try again soon
+                    self.expires_at[symbol] = time.time() + self.retry_interval
+                else:
+                    self.expires_at[symbol] = time.time() + self.update_interval + random.uniform(-self.expiry_jitter, self.expiry_jitter)
+    
+    def mark_updated(self, symbol):
+        """Bump a symbol's state version, dropping responses rendered from the old state"""
+        self.versions[symbol] = self.versions.get(symbol, 0) + 1
+        response_cache.invalidate(symbol)
+    
+    def _fetch_24h_tickers(self, symbols):
+        """Get Binance 24h ticker stats for several coins in a single request"""
+        try:
+            url = "https://api.binance.com/api/v3/ticker/24hr"
+            params = {'symbols': json.dumps([f"{symbol}USDT" for symbol in symbols], separators=(',', ':'))}
+            r = requests.get(url, params=params, timeout=HTTP_TIMEOUT)
+            r.raise_for_status()
+            return {ticker['symbol'][:-len('USDT')]: ticker for ticker in r.json()}
+        except Exception as e:
+            print(f"Error getting 24h tickers: {e}")
+            return {}
     
-    def _update_symbol_state(self, symbol):
+    def _update_symbol_state(self, symbol, ticker, gbp_rate):
         """Update market state for a specific symbol using real data points"""
         try:
             # Get actual price and calculate real metrics
-            usd_price = float(get_crypto_price(symbol) or 0)
-            gbp_price = convert_usd_to_gbp(usd_price)
+            usd_price = float(ticker['lastPrice']) if ticker else 0.0
+            gbp_price = usd_price * gbp_rate
             
             # Get 24h price change (use Binance API for real data)
-            price_change = self._get_24h_price_change(symbol)
+            price_change = self._get_24h_price_change(ticker)
             
             # Calculate volume change (another real metric)
-            volume_change = self._get_volume_trend(symbol)
+            volume_change = self._get_volume_trend(ticker)
             
             # Factor in current day of week (weekend vs. weekday trends)
             day_of_week = datetime.datetime.now().weekday()
@@ -151,7 +291,7 @@ class MarketStateManager:
                 direction = "neutral"
             
             # Generate an appropriate pattern based on the direction and actual data
-            patterns = self._get_appropriate_patterns(symbol, direction, price_change, volume_change)
+            patterns = self._get_appropriate_patterns(symbol, direction, price_change, volume_change, gbp_price)
             
             # Store all the state information
             self.market_states[symbol] = {
@@ -171,33 +311,27 @@ class MarketStateManager:
                 'price': 0.0,
                 'direction': "neutral",
                 'msi_value': 50,
-                'patterns': self._get_appropriate_patterns(symbol, "neutral", 0, 0),
+                'patterns': self._get_appropriate_patterns(symbol, "neutral", 0, 0, 0.0),
                 'price_change_24h': 0,
                 'volume_change': 0,
                 'updated_at': time.time()
             }
     
-    def _get_24h_price_change(self, symbol):
-        """Get actual 24h price change percentage"""
+    def _get_24h_price_change(self, ticker):
+        """Get actual 24h price change percentage from the ticker stats"""
         try:
-            url = f"https://api.binance.com/api/v3/ticker/24hr?symbol={symbol}USDT"
-            r = requests.get(url)
-            data = r.json()
-            return float(data.get('priceChangePercent', 0)) / 100  # Convert to decimal
+            return float(ticker.get('priceChangePercent', 0)) / 100  # Convert to decimal
         except Exception as e:
             print(f"Error getting 24h price change: {e}")
             # Use a slight random change as fallback
             return random.uniform(-0.02, 0.02)
     
-    def _get_volume_trend(self, symbol):
-        """Get volume trend based on actual data"""
+    def _get_volume_trend(self, ticker):
+        """Get volume trend based on the ticker stats"""
         try:
-            url = f"https://api.binance.com/api/v3/ticker/24hr?symbol={symbol}USDT"
-            r = requests.get(url)
-            data = r.json()
             # Calculate volume change trend (normalized between -1 and 1)
-            volume = float(data.get('volume', 0))
-            quote_volume = float(data.get('quoteVolume', 0))
+            volume = float(ticker.get('volume', 0))
+            quote_volume = float(ticker.get('quoteVolume', 0))
             
             # Use a simple metric based on available volume data
             if volume > 0 and quote_volume > 0:
@@ -208,12 +342,8 @@ class MarketStateManager:
             print(f"Error getting volume trend: {e}")
             return random.uniform(-0.5, 0.5)
     
-    def _get_appropriate_patterns(self, symbol, direction, price_change, volume_change):
+    def _get_appropriate_patterns(self, symbol, direction, price_change, volume_change, gbp_price):
         """Get appropriate chart patterns based on direction and actual metrics"""
-        # Get basic price for calculating targets
-        usd_price = float(get_crypto_price(symbol) or 0)
-        gbp_price = convert_usd_to_gbp(usd_price)
-        
         patterns = {
             'bullish': [
                 {"text": f"📈 Ascending triangle pattern with strong volume support", "direction": "bullish", "success_rate": "58%", "target": f"£{gbp_price * 1.05:.2f}"},
@@ -262,12 +392,186 @@ class MarketStateManager:
         
         return patterns[direction][pattern_index]
 
+# Exchange rates served from memory, refreshed by the refresh_fx_rates task
+fx_service = FxRateService(base='USD', fallback_rates={'GBP': USD_TO_GBP_RATE}, timeout=HTTP_TIMEOUT)
+
 # Create global market state manager
 market_manager = MarketStateManager()
 
+blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_POOL_SIZE, thread_name_prefix='crypto-bot-http')
+
+async def run_blocking(func, *args):
+    """Run a blocking helper on the worker pool without holding up the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, functools.partial(func, *args))
+
+response_cache = ResponseCache(max_entries=RESPONSE_CACHE_MAX_ENTRIES)
+
+# Renders in progress, so a burst of identical commands waits on one build instead of starting many
+response_builds = {}
+
+async def get_cached_embed(command, symbol, build, version=None, ttl=None):
+    """Serve a command's embed from the response cache, rendering it on the worker pool if needed.
+
+    version defaults to the symbol's market state version. It is read before
+    rendering, so an embed built while the state changes is filed under the
+    old version and never served after the update.
+
+    The cached embed carries no time: each response is stamped with the
+    time it is sent, which Discord shows next to the footer.
+    """
+    if version is None:
+        if symbol not in market_manager.market_states:
+            await run_blocking(market_manager.get_state, symbol)  # Load before reading the version
+        version = market_manager.versions.get(symbol, 0)
+    payload = response_cache.get(command, symbol, version)
+    if payload is None:
+        key = (command, symbol, version)
+        build_task = response_builds.get(key)
+        if build_task is None:
+            def render():
+                rendered = build(symbol).to_dict()
+                response_cache.put(command, symbol, version, rendered, ttl=ttl)
+                return rendered
+            build_task = response_builds[key] = asyncio.ensure_future(run_blocking(render))
+            build_task.add_done_callback(lambda _: response_builds.pop(key, None))
+        payload = await build_task
+    # Each response gets its own Embed so nothing can modify the cached copy
+    embed = discord.Embed.from_dict(payload)
+    embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+    return embed
+
+# Pooled HTTP session for the news monitor, kept open for the life of the bot
+news_session = None
+
+# Per-source ETag, Last-Modified and headline hash from the last fully processed fetch
+news_source_cache = {}
+
+# Headline markup is the part of a page that matters for change detection
+HEADLINE_REGION_PATTERN = re.compile(r'<h[1-6][^>]*>.*?</h[1-6]>', re.IGNORECASE | re.DOTALL)
+
+def get_news_session():
+    """Get the shared news session, creating it on first use"""
+    global news_session
+    if news_session is None or news_session.closed:
+        connector = aiohttp.TCPConnector(limit=NEWS_FETCH_CONCURRENCY, ttl_dns_cache=300)
+        news_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=NEWS_FETCH_TIMEOUT)
+        )
+    return news_session
+
+async def close_news_session():
+    """Close the shared news session"""
+    global news_session
+    if news_session is not None and not news_session.closed:
+        await news_session.close()
+    news_session = None
+
+# Central queue for everything the bot posts to channels
+outbound = OutboundScheduler()
+
+def get_subscribers(alert_type, coins=None):
+    """Get (channel, coins) pairs for every channel subscribed to an alert type"""
+    subscriptions.reload_if_changed()
+    if subscriptions.subscriptions:
+        targets = subscriptions.channels_for(alert_type, coins)
+    else:
+        # Nobody has subscribed yet: keep posting everything to the default channel
+        targets = {CHANNEL_ID: list(SUPPORTED_COINS)}
+    
+    subscribers = []
+    for channel_id, channel_coins in targets.items():
+        channel = bot.get_channel(channel_id)
+        if channel is None:
+            # In sharded mode channels of guilds on other shards are handled by their own process
+            if BOT_ROLE != 'shard':
+                print(f"Channel with ID {channel_id} not found!")
+            continue
+        subscribers.append((channel, channel_coins))
+    return subscribers
+
+runtime_snapshot = RuntimeSnapshot(RUNTIME_SNAPSHOT_FILE, max_age_seconds=RUNTIME_SNAPSHOT_MAX_AGE_HOURS * 3600)
+runtime_restored = False
+
+def collect_runtime_state():
+    """Copy the state worth keeping across a restart into JSON-friendly form"""
+    last_checked = getattr(scan_for_breaking_news, 'last_checked', {})
+    return {
+        'market_states': dict(market_manager.market_states),
+        'market_expires_at': dict(market_manager.expires_at),
+        'fx_rates': dict(fx_service.rates),
+        'fx_updated_at': fx_service.updated_at,
+        'last_checked': {source_url: checked.timestamp() for source_url, checked in last_checked.items()},
+        'news_source_cache': dict(news_source_cache),
+        'feed_cursors': {
+            feed_url: {'seeded': cursor['seeded'], 'guids': list(cursor['guids'].items())}
+            for feed_url, cursor in feed_reader.cursors.items()
+        },
+        'breaking_news_queue': [breaking_news for _, _, breaking_news in sorted(breaking_news_queue)]
+    }
+
+def restore_runtime_state():
+    """Reload the last runtime snapshot, keeping only the parts that are still fresh"""
+    global runtime_restored
+    if runtime_restored:
+        return
+    runtime_restored = True
+    state, age = runtime_snapshot.load()
+    if state is None:
+        return
+    try:
+        now = time.time()
+        # Market snapshots older than two update intervals would show misleading prices
+        for symbol, market_state in state['market_states'].items():
+            if symbol in SUPPORTED_COINS and now - market_state['updated_at'] < 2 * market_manager.update_interval:
+                market_manager.market_states[symbol] = market_state
+                market_manager.expires_at[symbol] = state['market_expires_at'].get(symbol, 0)
+                market_manager.mark_updated(symbol)
+        
+        # An old rate table still beats the fallback rate, but only a recent one skips the refresh
+        if state['fx_rates']:
+            fx_service.rates = state['fx_rates']
+            if now - state['fx_updated_at'] < FX_REFRESH_MINUTES * 60:
+                fx_service.updated_at = state['fx_updated_at']
+        
+        scan_for_breaking_news.last_checked = {
+            source_url: datetime.datetime.fromtimestamp(checked)
+            for source_url, checked in state['last_checked'].items()
+        }
+        news_source_cache.update(state['news_source_cache'])
+        for feed_url, cursor in state['feed_cursors'].items():
+            # Snapshots from before feeds were seeded had always read their feeds already
+            feed_reader.cursors[feed_url] = {'seeded': cursor.get('seeded', True), 'guids': OrderedDict(cursor['guids'])}
+        
+        # Queued stories are already marked as sent, so they'd be lost for good if dropped here
+        if age < QUEUED_NEWS_MAX_AGE_MINUTES * 60:
+            queue_breaking_news(state['breaking_news_queue'])
+        
+        print(f"Restored runtime state saved {age:.0f}s ago ({len(market_manager.market_states)} market snapshots)")
+    except Exception as e:
+        print(f"Error restoring runtime state: {e}")
+
+class CryptoBot(commands.AutoShardedBot if BOT_ROLE == 'shard' else commands.Bot):
+    """Bot that also releases the shared HTTP resources on shutdown"""
+
+    async def close(self):
+        if BOT_ROLE != 'shard':
+            runtime_snapshot.save(collect_runtime_state())
+        await outbound.close()
+        await close_news_session()
+        blocking_executor.shutdown(wait=False)
+        await super().close()
+
 intents = discord.Intents.default()
 # No message content intent needed for slash commands
-bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
+if BOT_ROLE == 'shard':
+    bot = CryptoBot(command_prefix='!', intents=intents, help_command=None, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS)
+else:
+    bot = CryptoBot(command_prefix='!', intents=intents, help_command=None)
+
+# Connection to the hub process when running as a shard
+hub_subscriber = None
 
 @bot.event
 async def on_ready():
@@ -275,12 +579,25 @@ async def on_ready():
     await bot.change_presence(activity=discord.Activity(type=discord.ActivityType.watching, name="crypto markets"))
     
     # Start background tasks
-    market_insights.start()
-    technical_analysis.start()
-    major_news_alerts.start()
-    monitor_breaking_news.start()
-    
-    # Sync slash commands if not already synced
+    if BOT_ROLE == 'shard':
+        # Market data and news come from the hub instead of being fetched by every shard.
+        # The scheduled posts start once the first market data has arrived
+        start_hub_subscriber()
+    else:
+        market_insights.start()
+        technical_analysis.start()
+        # Start from the last snapshot so a redeploy doesn't refetch everything at once
+        restore_runtime_state()
+        major_news_alerts.start()
+        monitor_breaking_news.start()
+        drain_breaking_news.start()
+        refresh_fx_rates.start()
+        warm_market_cache.start()
+        save_runtime_snapshot.start()
+    
+    # Sync slash commands if not already synced (commands are global, so one shard process is enough)
+    if BOT_ROLE == 'shard' and 0 not in SHARD_IDS:
+        return
     try:
         synced = await bot.tree.sync()
         print(f"Synced {len(synced)} command(s)")
@@ -320,6 +637,18 @@ async def help_command(interaction: discord.Interaction):
         inline=False
     )
     
+    embed.add_field(
+        name="🕒 /history [coin]",
+        value="Shows the most recent buy/hold signals from the trading signal analysis, with how confident each one was.",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🔔 /subscribe [coins] [alerts]",
+        value="Choose which coins and automatic posts this channel receives (insights, technical, news_alerts, breaking_news). Use /unsubscribe to stop them.",
+        inline=False
+    )
+    
     embed.add_field(
         name="❓ /help",
         value="Shows this guide to help you understand how to use the bot",
@@ -345,29 +674,27 @@ async def price(interaction: discord.Interaction, symbol: str):
         await interaction.response.send_message(f"I only support these coins: {', '.join(SUPPORTED_COINS)}")
         return
         
-    usd_price = get_crypto_price(symbol)
-    if usd_price:
-        # Convert to GBP
-        gbp_price = convert_usd_to_gbp(float(usd_price))
+    # Served from the warmed market snapshot; only a cold start goes upstream
+    await interaction.response.defer()
+    try:
+        state = await run_blocking(market_manager.get_state, symbol)
+    except MarketDataNotReady:
+        await interaction.followup.send(MARKET_DATA_NOT_READY_MESSAGE)
+        return
+    if state['price']:
+        gbp_price = state['price']
         embed = discord.Embed(
             title=f"{symbol} Price",
             description=f"The current price of {symbol} is £{gbp_price:.2f}",
             color=0x00FF00
         )
-        embed.set_footer(text=f"Data from Binance • {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        await interaction.response.send_message(embed=embed)
+        embed.set_footer(text=f"Data from Binance • {datetime.datetime.fromtimestamp(state['updated_at']).strftime('%Y-%m-%d %H:%M:%S')}")
+        await interaction.followup.send(embed=embed)
     else:
-        await interaction.response.send_message(f"Could not fetch price for {symbol}")
+        await interaction.followup.send(f"Could not fetch price for {symbol}")
 
-@bot.tree.command(name="analysis", description="Get technical analysis for a cryptocurrency")
-@app_commands.describe(symbol="The cryptocurrency symbol (BTC, XRP, or HBAR)")
-async def analysis(interaction: discord.Interaction, symbol: str):
-    """Get technical analysis for a cryptocurrency"""        
-    symbol = symbol.upper()
-    if symbol not in SUPPORTED_COINS:
-        await interaction.response.send_message(f"I only support these coins: {', '.join(SUPPORTED_COINS)}")
-        return
-    
+def build_analysis_embed(symbol):
+    """Render the /analysis embed for a symbol"""
     # Get simulated technical analysis
     analysis_data = get_technical_analysis(symbol)
     
@@ -408,11 +735,28 @@ async def analysis(interaction: discord.Interaction, symbol: str):
         inline=False
     )
     
-    # Use current date to avoid future date issues
-    current_date = datetime.datetime.now()
-    embed.set_footer(text=f"Analysis based on data from the past 24 hours • {current_date.strftime('%Y-%m-%d %H:%M:%S')}")  # Current date and time
+    # The time is added when the embed is sent, the rendered embed is reused for a while
+    embed.set_footer(text="Analysis based on data from the past 24 hours")
     
-    await interaction.response.send_message(embed=embed)
+    return embed
+
+@bot.tree.command(name="analysis", description="Get technical analysis for a cryptocurrency")
+@app_commands.describe(symbol="The cryptocurrency symbol (BTC, XRP, or HBAR)")
+async def analysis(interaction: discord.Interaction, symbol: str):
+    """Get technical analysis for a cryptocurrency"""        
+    symbol = symbol.upper()
+    if symbol not in SUPPORTED_COINS:
+        await interaction.response.send_message(f"I only support these coins: {', '.join(SUPPORTED_COINS)}")
+        return
+    
+    # Rendered once per market state update and reused until the next one
+    await interaction.response.defer()
+    try:
+        embed = await get_cached_embed('analysis', symbol, build_analysis_embed)
+    except MarketDataNotReady:
+        await interaction.followup.send(MARKET_DATA_NOT_READY_MESSAGE)
+        return
+    await interaction.followup.send(embed=embed)
 
 def get_pattern_explanation(direction):
     """Get a simple explanation of what the pattern direction means for beginners"""
@@ -423,15 +767,8 @@ def get_pattern_explanation(direction):
     else:
         return "This pattern suggests the price might continue moving sideways for a while."
 
-@bot.tree.command(name="predict", description="Get price prediction for a cryptocurrency")
-@app_commands.describe(symbol="The cryptocurrency symbol (BTC, XRP, or HBAR)")
-async def predict(interaction: discord.Interaction, symbol: str):
-    """Get price prediction for a cryptocurrency"""        
-    symbol = symbol.upper()
-    if symbol not in SUPPORTED_COINS:
-        await interaction.response.send_message(f"I only support these coins: {', '.join(SUPPORTED_COINS)}")
-        return
-    
+def build_prediction_embed(symbol):
+    """Render the /predict embed for a symbol"""
     # Get simulated prediction data
     prediction = get_price_prediction(symbol)
     
@@ -519,17 +856,28 @@ async def predict(interaction: discord.Interaction, symbol: str):
     # Add simplified disclaimer
     embed.set_footer(text="⚠️ REMINDER: This is just a prediction. Crypto is risky and prices can change unexpectedly.")
     
-    await interaction.response.send_message(embed=embed)
+    return embed
 
-@bot.tree.command(name="news", description="Get latest news for a cryptocurrency")
+@bot.tree.command(name="predict", description="Get price prediction for a cryptocurrency")
 @app_commands.describe(symbol="The cryptocurrency symbol (BTC, XRP, or HBAR)")
-async def news(interaction: discord.Interaction, symbol: str):
-    """Get latest news for a cryptocurrency"""        
+async def predict(interaction: discord.Interaction, symbol: str):
+    """Get price prediction for a cryptocurrency"""        
     symbol = symbol.upper()
     if symbol not in SUPPORTED_COINS:
         await interaction.response.send_message(f"I only support these coins: {', '.join(SUPPORTED_COINS)}")
         return
     
+    # Rendered once per market state update and reused until the next one
+    await interaction.response.defer()
+    try:
+        embed = await get_cached_embed('predict', symbol, build_prediction_embed)
+    except MarketDataNotReady:
+        await interaction.followup.send(MARKET_DATA_NOT_READY_MESSAGE)
+        return
+    await interaction.followup.send(embed=embed)
+
+def build_news_embed(symbol):
+    """Render the /news embed for a symbol"""
     # Get simulated news data
     news_items = get_crypto_news(symbol)
     
@@ -569,51 +917,177 @@ async def news(interaction: discord.Interaction, symbol: str):
             inline=False
         )
     
-    embed.set_footer(text=f"News collected from various sources • {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    # The time is added when the embed is sent, the rendered embed is reused for a while
+    embed.set_footer(text="News collected from various sources")
     
-    await interaction.response.send_message(embed=embed)
+    return embed
 
-@tasks.loop(minutes=30)
-async def market_insights():
-    """Regularly post market insights for the supported coins"""
-    channel = bot.get_channel(CHANNEL_ID)
-    if channel is None:
-        print(f"Channel with ID {CHANNEL_ID} not found!")
+@bot.tree.command(name="news", description="Get latest news for a cryptocurrency")
+@app_commands.describe(symbol="The cryptocurrency symbol (BTC, XRP, or HBAR)")
+async def news(interaction: discord.Interaction, symbol: str):
+    """Get latest news for a cryptocurrency"""        
+    symbol = symbol.upper()
+    if symbol not in SUPPORTED_COINS:
+        await interaction.response.send_message(f"I only support these coins: {', '.join(SUPPORTED_COINS)}")
         return
     
-    # Get market overview for all supported coins
-    overview = get_market_overview()
+    # News doesn't follow the market state, so its cached embed also gets an expiry
+    await interaction.response.defer()
+    embed = await get_cached_embed('news', symbol, build_news_embed, version=0, ttl=NEWS_RESPONSE_TTL)
+    await interaction.followup.send(embed=embed)
+
+def build_history_embed(symbol):
+    """Render the /history embed from the stored trading signals"""
+    pair = f"{symbol}USDT"  # The analysis app stores Binance-style pairs
+    recent, _ = signal_history.signals(symbol=pair, limit=HISTORY_LIMIT, newest_first=True)
     
     embed = discord.Embed(
-        title="Crypto Market Insights",
-        description=f"Current market overview for tracked cryptocurrencies:",
-        color=0x00FFFF
+        title=f"Signal History for {symbol}",
+        description=f"The last {len(recent)} trading signals for {symbol}, newest first:" if recent else f"No trading signals have been stored for {symbol} yet.",
+        color=0x1E90FF
     )
+    for signal in recent:
+        when = datetime.datetime.fromtimestamp(signal['timestamp']).strftime('%Y-%m-%d %H:%M')
+        price = f"${signal['current_price']:,.2f}" if signal['current_price'] is not None else "n/a"
+        embed.add_field(
+            name=f"{'🟢' if signal['recommendation'] == 'BUY' else '⚪'} {signal['recommendation']} • {when}",
+            value=f"Confidence: {signal['confidence'] * 100:.1f}% • Price: {price}",
+            inline=False
+        )
     
-    for coin, data in overview.items():
+    # How confident the signals for this coin usually are
+    counts = signal_history.confidence_distribution(pair, buckets=5).get(pair)
+    if counts:
         embed.add_field(
-            name=f"{coin} (£{data['price']:.2f})",
-            value=f"24h Change: {data['change_24h']}%\nVolume: £{data['volume']}\nMarket Sentiment: {data['sentiment']}",
+            name="Confidence Spread (all signals)",
+            value=" | ".join(f"{bucket * 20}-{(bucket + 1) * 20}%: {count}" for bucket, count in enumerate(counts)),
             inline=False
         )
     
-    # Use current date to avoid future date issues    current_date = datetime.datetime.now()    embed.set_footer(text=f"Market data updated every 30 minutes • {current_date.strftime('%Y-%m-%d %H:%M:%S')}")
+    embed.set_footer(text="Signals come from the trading signal analysis • Prices in US Dollars ($)")
+    return embed
+
+@bot.tree.command(name="history", description="Show recent trading signals for a cryptocurrency")
+@app_commands.describe(symbol="The cryptocurrency symbol (BTC, XRP, or HBAR)")
+async def history(interaction: discord.Interaction, symbol: str):
+    """Show recent trading signals for a cryptocurrency"""
+    symbol = symbol.upper()
+    if symbol not in SUPPORTED_COINS:
+        await interaction.response.send_message(f"I only support these coins: {', '.join(SUPPORTED_COINS)}")
+        return
+    
+    await interaction.response.defer()
+    try:
+        embed = await run_blocking(build_history_embed, symbol)
+    except Exception as e:
+        print(f"Error reading signal history: {e}")
+        await interaction.followup.send(f"Could not read the signal history for {symbol}")
+        return
+    await interaction.followup.send(embed=embed)
+
+def parse_choices(text, allowed):
+    """Parse a comma-separated list of choices, where 'all' means every allowed choice"""
+    if text.strip().lower() == 'all':
+        return list(allowed), []
+    chosen, invalid = [], []
+    for item in text.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        match = next((choice for choice in allowed if choice.lower() == item.lower()), None)
+        if match is None:
+            invalid.append(item)
+        elif match not in chosen:
+            chosen.append(match)
+    return chosen, invalid
+
+@bot.tree.command(name="subscribe", description="Choose which coins and alerts this channel receives")
+@app_commands.describe(
+    coins="Comma-separated coins (BTC, XRP, HBAR) or 'all'",
+    alerts="Comma-separated alert types (insights, technical, news_alerts, breaking_news) or 'all'"
+)
+@app_commands.default_permissions(manage_channels=True)
+@app_commands.guild_only()
+async def subscribe(interaction: discord.Interaction, coins: str = 'all', alerts: str = 'all'):
+    """Subscribe this channel to scheduled posts"""
+    chosen_coins, invalid_coins = parse_choices(coins, SUPPORTED_COINS)
+    chosen_alerts, invalid_alerts = parse_choices(alerts, ALERT_TYPES)
+    if invalid_coins or invalid_alerts or not chosen_coins or not chosen_alerts:
+        await interaction.response.send_message(
+            f"I only support these coins: {', '.join(SUPPORTED_COINS)}\nand these alerts: {', '.join(ALERT_TYPES)}",
+            ephemeral=True
+        )
+        return
+    
+    subscriptions.subscribe(interaction.guild_id, interaction.channel_id, chosen_coins, chosen_alerts)
+    embed = discord.Embed(
+        title="Subscription Saved",
+        description=f"This channel will receive {', '.join(chosen_alerts)} for {', '.join(chosen_coins)}.",
+        color=0x00FF00
+    )
+    await interaction.response.send_message(embed=embed)
+
+@bot.tree.command(name="unsubscribe", description="Stop scheduled posts in this channel")
+@app_commands.default_permissions(manage_channels=True)
+@app_commands.guild_only()
+async def unsubscribe(interaction: discord.Interaction):
+    """Unsubscribe this channel from scheduled posts"""
+    if subscriptions.unsubscribe(interaction.channel_id):
+        await interaction.response.send_message("This channel will no longer receive scheduled posts.")
+    else:
+        await interaction.response.send_message("This channel has no subscription.", ephemeral=True)
+
+@tasks.loop(minutes=30)
+async def market_insights():
+    """Regularly post market insights for the supported coins"""
+    subscribers = get_subscribers('insights')
+    if not subscribers:
+        return
+    
+    # Get market overview once for every coin any subscriber follows
+    coins = [coin for coin in SUPPORTED_COINS if any(coin in channel_coins for _, channel_coins in subscribers)]
+    try:
+        overview = await run_blocking(get_market_overview, coins)
+    except MarketDataNotReady as e:
+        print(f"Skipping market insights, no market data for {e} yet")
+        return
     
-    await channel.send(embed=embed)
+    for channel, channel_coins in subscribers:
+        embed = discord.Embed(
+            title="Crypto Market Insights",
+            description=f"Current market overview for tracked cryptocurrencies:",
+            color=0x00FFFF
+        )
+        
+        for coin, data in overview.items():
+            if coin not in channel_coins:
+                continue
+            embed.add_field(
+                name=f"{coin} (£{data['price']:.2f})",
+                value=f"24h Change: {data['change_24h']}%\nVolume: £{data['volume']}\nMarket Sentiment: {data['sentiment']}",
+                inline=False
+            )
+        
+        # Use current date to avoid future date issues    current_date = datetime.datetime.now()    embed.set_footer(text=f"Market data updated every 30 minutes • {current_date.strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        outbound.submit(channel, embed=embed, priority=PRIORITY_INSIGHT)
 
 @tasks.loop(hours=4)
 async def technical_analysis():
     """Post detailed technical analysis every 4 hours"""
-    channel = bot.get_channel(CHANNEL_ID)
-    if channel is None:
-        print(f"Channel with ID {CHANNEL_ID} not found!")
+    subscribers = get_subscribers('technical')
+    if not subscribers:
         return
     
-    # Select a random coin to analyze
-    coin = random.choice(SUPPORTED_COINS)
+    # Select a random coin to analyze from those subscribers follow
+    coin = random.choice([coin for coin in SUPPORTED_COINS if any(coin in channel_coins for _, channel_coins in subscribers)])
     
     # Get detailed analysis
-    analysis_data = get_technical_analysis(coin)
+    try:
+        analysis_data = await run_blocking(get_technical_analysis, coin)
+    except MarketDataNotReady:
+        print(f"Skipping technical analysis post, no market data for {coin} yet")
+        return
     
     embed = discord.Embed(
         title=f"Technical Analysis Update: {coin}",
@@ -651,203 +1125,493 @@ async def technical_analysis():
     
     embed.set_footer(text="⚠️ This is not financial advice. Always do your own research.")
     
-    await channel.send(embed=embed)
+    # Built once, sent to every channel following this coin
+    for channel, channel_coins in subscribers:
+        if coin in channel_coins:
+            outbound.submit(channel, embed=embed, priority=PRIORITY_INSIGHT)
 
 @tasks.loop(minutes=45)
 async def major_news_alerts():
     """Check for major news events that could impact prices"""
-    channel = bot.get_channel(CHANNEL_ID)
-    if channel is None:
-        print(f"Channel with ID {CHANNEL_ID} not found!")
+    if not get_subscribers('news_alerts'):
         return
     
     # Check for significant news events
     breaking_news = check_for_breaking_news()
     if breaking_news:
-        embed = discord.Embed(
-            title=f"🚨 BREAKING NEWS: {breaking_news['title']}",
-            description=breaking_news['description'],
-            color=0xFF0000
+        post_news_alert(breaking_news)
+
+def post_news_alert(breaking_news):
+    """Send a major news alert to every channel following the affected coins"""
+    embed = discord.Embed(
+        title=f"🚨 BREAKING NEWS: {breaking_news['title']}",
+        description=breaking_news['description'],
+        color=0xFF0000
+    )
+    
+    embed.add_field(
+        name="Potential Impact",
+        value=breaking_news['impact'],
+        inline=False
+    )
+    
+    embed.add_field(
+        name="Affected Cryptocurrencies",
+        value=", ".join(breaking_news['affected_coins']),
+        inline=False
+    )
+    
+    if breaking_news['source_url']:
+        embed.add_field(
+            name="Source",
+            value=f"[Click here to read more]({breaking_news['source_url']})",
+            inline=False
         )
-        
+    
+    embed.set_footer(text=f"Breaking news alert • {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    for channel, _ in get_subscribers('news_alerts', breaking_news['affected_coins']):
+        outbound.submit(channel, "@here", embed=embed, priority=PRIORITY_ALERT)
+
+@tasks.loop(minutes=5)
+async def refresh_fx_rates():
+    """Refresh the exchange rate table in the background once it is FX_REFRESH_MINUTES old"""
+    if time.time() - fx_service.updated_at >= FX_REFRESH_MINUTES * 60:
+        await run_blocking(fx_service.refresh)
+
+@tasks.loop(seconds=MARKET_WARM_SECONDS)
+async def warm_market_cache():
+    """Keep price, 24h stats and market state for all supported coins fresh ahead of demand"""
+    await run_blocking(market_manager.refresh_due)
+
+@tasks.loop(minutes=RUNTIME_SNAPSHOT_MINUTES)
+async def save_runtime_snapshot():
+    """Periodically save runtime state for a warm restart"""
+    await run_blocking(runtime_snapshot.save, collect_runtime_state())
+
+@tasks.loop(seconds=90)  # Scan more frequently (every 90 seconds)
+async def monitor_breaking_news():
+    """Monitor for breaking news that could impact crypto prices and send immediate alerts"""
+    if not get_subscribers('breaking_news'):
+        return
+    
+    try:
+        # Queue every new story from the sources; drain_breaking_news posts them in priority order
+        queue_breaking_news(await scan_for_breaking_news())
+    
+    except Exception as e:
+        print(f"Error in news monitoring: {e}")
+
+@tasks.loop(seconds=BREAKING_NEWS_DRAIN_SECONDS)
+async def drain_breaking_news():
+    """Post the most important queued breaking news story"""
+    breaking_news = pop_breaking_news()
+    if breaking_news:
+        post_breaking_news(breaking_news)
+
+def post_breaking_news(breaking_news):
+    """Send a breaking news alert to every channel following the affected coins"""
+    # Set color based on sentiment
+    if breaking_news['sentiment'] > 0.2:
+        color = 0x00FF00  # Green for positive
+        market_impact = "POSITIVE FOR MARKET 📈"
+    elif breaking_news['sentiment'] < -0.2:
+        color = 0xFF0000  # Red for negative
+        market_impact = "NEGATIVE FOR MARKET 📉"
+    else:
+        color = 0xFFAA00  # Amber for neutral/mixed
+        market_impact = "MIXED IMPACT ON MARKET ↔️"
+    
+    # Format as urgent alert with impact assessment
+    embed = discord.Embed(
+        title=f"🚨 {market_impact}: {breaking_news['title']}",
+        description=breaking_news['summary'],
+        color=color
+    )
+    
+    # Add specific crypto impact analysis
+    positive_coins = breaking_news.get('positive_impact_coins', [])
+    negative_coins = breaking_news.get('negative_impact_coins', [])
+    
+    if positive_coins:
         embed.add_field(
-            name="Potential Impact",
-            value=breaking_news['impact'],
+            name="🟢 POTENTIALLY BULLISH FOR:",
+            value=", ".join(positive_coins) + "\n" + breaking_news.get('positive_reason', ''),
             inline=False
         )
         
+    if negative_coins:
         embed.add_field(
-            name="Affected Cryptocurrencies",
-            value=", ".join(breaking_news['affected_coins']),
+            name="🔴 POTENTIALLY BEARISH FOR:",
+            value=", ".join(negative_coins) + "\n" + breaking_news.get('negative_reason', ''),
             inline=False
         )
+    
+    # Add detailed market impact analysis
+    embed.add_field(
+        name="Potential Market Impact",
+        value=breaking_news['impact_analysis'],
+        inline=False
+    )
+    
+    # Add source information with extra visibility if it's from Trump
+    source_info = f"[{breaking_news['source_name']}]({breaking_news['source_url']})"
+    if any(trump_term in breaking_news['title'].lower() for trump_term in ['trump', 'potus', 'president']):
+        source_info = f"⚠️ **TRUMP STATEMENT** ⚠️\n{source_info}"
         
-        if breaking_news['source_url']:
-            embed.add_field(
-                name="Source",
-                value=f"[Click here to read more]({breaking_news['source_url']})",
-                inline=False
-            )
-        
-        embed.set_footer(text=f"Breaking news alert • {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    embed.add_field(
+        name="Source",
+        value=source_info,
+        inline=False
+    )
+    
+    # Add advice on what to do now
+    if breaking_news['sentiment'] > 0.2:
+        action_advice = "Consider taking advantage of potential upward price movement for affected coins."
+    elif breaking_news['sentiment'] < -0.2:
+        action_advice = "Consider protecting your position in affected coins to minimize potential losses."
+    else:
+        action_advice = "Monitor the situation closely as market impact is still developing."
         
-        await channel.send("@here", embed=embed)
+    embed.add_field(
+        name="Suggested Action",
+        value=action_advice,
+        inline=False
+    )
+    
+    embed.set_footer(text=f"Breaking news detected at {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} • Sentiment: {breaking_news['sentiment_text']}")
+    if breaking_news.get('published_at'):
+        # Feed items carry the outlet's own publish time
+        embed.timestamp = datetime.datetime.fromtimestamp(breaking_news['published_at'], tz=datetime.timezone.utc)
+    
+    # Send as normal message without @here mention
+    for channel, _ in get_subscribers('breaking_news', breaking_news['affected_coins']):
+        outbound.submit(channel, "**BREAKING MARKET NEWS ALERT!**", embed=embed, priority=PRIORITY_BREAKING)
 
-@tasks.loop(seconds=90)  # Scan more frequently (every 90 seconds)
-async def monitor_breaking_news():
-    """Monitor for breaking news that could impact crypto prices and send immediate alerts"""
-    channel = bot.get_channel(CHANNEL_ID)
-    if channel is None:
-        print(f"Channel with ID {CHANNEL_ID} not found!")
+def start_hub_subscriber():
+    """Start receiving shared data from the hub process"""
+    global hub_subscriber
+    if hub_subscriber is not None:
         return
-    
+    loop = asyncio.get_running_loop()
+    hub_subscriber = SnapshotSubscriber(
+        ('127.0.0.1', HUB_PORT),
+        HUB_KEY,
+        lambda message: loop.call_soon_threadsafe(apply_hub_message, message)
+    )
+    hub_subscriber.start()
+
+def apply_hub_message(message):
+    """Use data computed once by the hub in this shard process"""
     try:
-        # Check for breaking news using various sources
-        breaking_news = await scan_for_breaking_news()
-        
-        if breaking_news:
-            # Set color based on sentiment
-            if breaking_news['sentiment'] > 0.2:
-                color = 0x00FF00  # Green for positive
-                market_impact = "POSITIVE FOR MARKET 📈"
-            elif breaking_news['sentiment'] < -0.2:
-                color = 0xFF0000  # Red for negative
-                market_impact = "NEGATIVE FOR MARKET 📉"
-            else:
-                color = 0xFFAA00  # Amber for neutral/mixed
-                market_impact = "MIXED IMPACT ON MARKET ↔️"
-            
-            # Format as urgent alert with impact assessment
-            embed = discord.Embed(
-                title=f"🚨 {market_impact}: {breaking_news['title']}",
-                description=breaking_news['summary'],
-                color=color
-            )
-            
-            # Add specific crypto impact analysis
-            positive_coins = breaking_news.get('positive_impact_coins', [])
-            negative_coins = breaking_news.get('negative_impact_coins', [])
-            
-            if positive_coins:
-                embed.add_field(
-                    name="🟢 POTENTIALLY BULLISH FOR:",
-                    value=", ".join(positive_coins) + "\n" + breaking_news.get('positive_reason', ''),
-                    inline=False
-                )
+        if message['type'] == 'market':
+            for symbol, market_state in message['states'].items():
+                previous = market_manager.market_states.get(symbol)
+                market_manager.market_states[symbol] = market_state
+                # The hub republishes unchanged snapshots, which shouldn't throw away cached responses
+                if previous is None or previous['updated_at'] != market_state['updated_at']:
+                    market_manager.mark_updated(symbol)
+            if message['fx_rates']:
+                fx_service.rates = message['fx_rates']
+            fx_service.updated_at = time.time()
+            if not market_insights.is_running():
+                market_insights.start()
+                technical_analysis.start()
+        elif message['type'] == 'breaking_news':
+            post_breaking_news(message['news'])
+        elif message['type'] == 'news_alert':
+            post_news_alert(message['news'])
+    except Exception as e:
+        print(f"Error applying hub message: {e}")
+
+async def run_hub(hub):
+    """Fetch market data and news once and publish them to every shard process"""
+    restore_runtime_state()
+    next_news_scan = next_news_alert = 0
+    # A rate table restored from the snapshot is only refreshed once it reaches its normal age
+    next_fx_refresh = time.monotonic() + max(FX_REFRESH_MINUTES * 60 - (time.time() - fx_service.updated_at), 0)
+    next_snapshot = time.monotonic() + RUNTIME_SNAPSHOT_MINUTES * 60
+    try:
+        while True:
+            now = time.monotonic()
+            try:
+                if now >= next_fx_refresh:
+                    await run_blocking(fx_service.refresh)
+                    next_fx_refresh = now + FX_REFRESH_MINUTES * 60
                 
-            if negative_coins:
-                embed.add_field(
-                    name="🔴 POTENTIALLY BEARISH FOR:",
-                    value=", ".join(negative_coins) + "\n" + breaking_news.get('negative_reason', ''),
-                    inline=False
-                )
-            
-            # Add detailed market impact analysis
-            embed.add_field(
-                name="Potential Market Impact",
-                value=breaking_news['impact_analysis'],
-                inline=False
-            )
-            
-            # Add source information with extra visibility if it's from Trump
-            source_info = f"[{breaking_news['source_name']}]({breaking_news['source_url']})"
-            if any(trump_term in breaking_news['title'].lower() for trump_term in ['trump', 'potus', 'president']):
-                source_info = f"⚠️ **TRUMP STATEMENT** ⚠️\n{source_info}"
+                await run_blocking(market_manager.refresh_due)
+                # Replayed to shards that (re)connect later
+                hub.publish({'type': 'market', 'states': dict(market_manager.market_states), 'fx_rates': dict(fx_service.rates)}, replay=True)
                 
-            embed.add_field(
-                name="Source",
-                value=source_info,
-                inline=False
-            )
-            
-            # Add advice on what to do now
-            if breaking_news['sentiment'] > 0.2:
-                action_advice = "Consider taking advantage of potential upward price movement for affected coins."
-            elif breaking_news['sentiment'] < -0.2:
-                action_advice = "Consider protecting your position in affected coins to minimize potential losses."
-            else:
-                action_advice = "Monitor the situation closely as market impact is still developing."
+                if now >= next_news_scan:
+                    next_news_scan = now + 90
+                    queue_breaking_news(await scan_for_breaking_news())
+                # Hand queued stories to the shards at the same pace as drain_breaking_news
+                for _ in range(max(MARKET_WARM_SECONDS // BREAKING_NEWS_DRAIN_SECONDS, 1)):
+                    breaking_news = pop_breaking_news()
+                    if breaking_news is None:
+                        break
+                    hub.publish({'type': 'breaking_news', 'news': breaking_news})
                 
-            embed.add_field(
-                name="Suggested Action",
-                value=action_advice,
-                inline=False
-            )
-            
-            embed.set_footer(text=f"Breaking news detected at {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} • Sentiment: {breaking_news['sentiment_text']}")
-            
-            # Send as normal message without @here mention
-            await channel.send("**BREAKING MARKET NEWS ALERT!**", embed=embed)
+                if now >= next_news_alert:
+                    next_news_alert = now + 45 * 60
+                    breaking_news = check_for_breaking_news()
+                    if breaking_news:
+                        hub.publish({'type': 'news_alert', 'news': breaking_news})
+                
+                if now >= next_snapshot:
+                    next_snapshot = now + RUNTIME_SNAPSHOT_MINUTES * 60
+                    await run_blocking(runtime_snapshot.save, collect_runtime_state())
+            except Exception as e:
+                print(f"Error in shard hub: {e}")
+            await asyncio.sleep(MARKET_WARM_SECONDS)
+    finally:
+        runtime_snapshot.save(collect_runtime_state())
+        await close_news_session()
+
+def run_sharded(shard_count, processes):
+    """Run shard_count gateway shards spread over several processes, all fed by one hub"""
+    hub = SnapshotHub()
+    shards = []
+    for index in range(processes):
+        shard_ids = list(range(shard_count))[index::processes]
+        if not shard_ids:
+            continue
+        env = dict(
+            os.environ,
+            BOT_ROLE='shard',
+            BOT_SHARD_COUNT=str(shard_count),
+            BOT_SHARD_IDS=','.join(str(shard_id) for shard_id in shard_ids),
+            BOT_HUB_PORT=str(hub.address[1]),
+            BOT_HUB_KEY=hub.authkey.hex()
+        )
+        shard = {'shard_ids': shard_ids, 'env': env}
+        start_shard_process(shard)
+        shards.append(shard)
     
+    async def run():
+        supervisor = asyncio.create_task(supervise_shards(shards))
+        try:
+            await run_hub(hub)
+        finally:
+            supervisor.cancel()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("Shutting down shards")
+    finally:
+        for shard in shards:
+            shard['process'].terminate()
+        hub.close()
+
+def start_shard_process(shard):
+    """Start (or restart) the process running a group of shards"""
+    shard['process'] = subprocess.Popen([sys.executable, os.path.abspath(__file__)], env=shard['env'])
+    shard['started_at'] = time.monotonic()
+    print(f"Started shard process for shards {shard['shard_ids']}")
+
+async def supervise_shards(shards):
+    """Restart shard processes that exit, so their guilds don't stay offline"""
+    while True:
+        await asyncio.sleep(SHARD_CHECK_SECONDS)
+        for shard in shards:
+            exit_code = shard['process'].poll()
+            if exit_code is None:
+                continue
+            # A shard that keeps crashing on startup is retried at a steady pace, not in a tight loop
+            if time.monotonic() - shard['started_at'] < SHARD_RESTART_DELAY:
+                continue
+            print(f"Shard process for shards {shard['shard_ids']} exited with code {exit_code}, restarting it")
+            start_shard_process(shard)
+
+def headline_region_hash(html_content):
+    """Hash the headline markup of a page, ignoring scripts, ads and timestamps elsewhere"""
+    digest = hashlib.blake2b(digest_size=16)
+    for match in HEADLINE_REGION_PATTERN.finditer(html_content):
+        digest.update(match.group(0).encode('utf-8', 'ignore'))
+    return digest.hexdigest()
+
+async def fetch_news_source(session, source_url):
+    """Fetch one news source page with a conditional request.
+
+    Returns (source_url, html, page_state). html is None when the request
+    failed or the page is unchanged since it was last processed.
+    """
+    cached = news_source_cache.get(source_url, {})
+    headers = {}
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+    try:
+        async with session.get(source_url, headers=headers) as response:
+            if response.status == 304:
+                return source_url, None, cached
+            if response.status == 200:
+                html_content = await response.text()
+                page_state = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'content_hash': headline_region_hash(html_content)
+                }
+                # Servers that ignore conditional headers still get skipped if the headlines are the same
+                if page_state['content_hash'] == cached.get('content_hash'):
+                    return source_url, None, page_state
+                return source_url, html_content, page_state
     except Exception as e:
-        print(f"Error in news monitoring: {e}")
+        print(f"Error checking {source_url}: {e!r}")
+    return source_url, None, cached
+
+async def fetch_news_feed(session, source_url, feed_url):
+    """Stream a news source's RSS/Atom feed, parsing it as it downloads.
+
+    Returns (source_url, items, page_state) where items are the feed entries
+    not seen before. Reading stops at the first already seen entry.
+    """
+    cached = news_source_cache.get(source_url, {})
+    headers = {}
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+    items = []
+    try:
+        async with session.get(feed_url, headers=headers) as response:
+            if response.status == 304:
+                return source_url, items, cached
+            if response.status == 200:
+                stream = feed_reader.open(feed_url)
+                async for chunk in response.content.iter_chunked(NEWS_FEED_CHUNK_SIZE):
+                    items.extend(stream.feed(chunk))
+                    if stream.reached_seen:
+                        break
+                else:
+                    items.extend(stream.close())
+                page_state = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
+                return source_url, items, page_state
+            print(f"Error checking {feed_url}: HTTP {response.status}")
+    except Exception as e:
+        print(f"Error checking {feed_url}: {e!r}")
+    # Items parsed before a failure are already past the feed's cursor, so still hand them back
+    return source_url, items, cached
 
 async def scan_for_breaking_news():
     """Scan various sources for breaking crypto news with market impact"""
     last_checked = getattr(scan_for_breaking_news, 'last_checked', {})
-    last_news_hash = getattr(scan_for_breaking_news, 'last_news_hash', '')
     scan_for_breaking_news.last_checked = last_checked
     now = datetime.datetime.now()
-    async with aiohttp.ClientSession() as session:
-        for source_url in NEWS_SOURCES:
-            if source_url in last_checked and now - last_checked[source_url] < timedelta(minutes=5):
-                continue
-            try:
-                async with session.get(source_url, timeout=10) as response:
-                    if response.status == 200:
-                        html_content = await response.text()
-                        for entity in MARKET_MOVERS:
-                            pattern = re.compile(f"<h\\d[^>]*>.*({entity}).*?</h\\d>", re.IGNORECASE)
-                            headlines = pattern.findall(html_content)
-                            if headlines:
-                                for headline in headlines:
-                                    clean_headline = re.sub('<.*?>', '', headline)
-                                    headline_hash = hash(clean_headline)
-                                    # Only send if not already sent
-                                    if headline_hash == last_news_hash or headline_hash in sent_news_hashes:
-                                        continue
-                                    scan_for_breaking_news.last_news_hash = headline_hash
-                                    sent_news_hashes.add(headline_hash)
-                                    article_url = find_article_url(html_content, clean_headline, source_url)
-                                    affected_coins_analysis = analyze_crypto_impact(clean_headline, entity)
-                                    sentiment_score = calculate_news_sentiment(clean_headline)
-                                    sentiment_text = get_sentiment_text(sentiment_score)
-                                    impact_analysis = generate_impact_analysis(clean_headline, entity, sentiment_score)
-                                    is_trump_related = any(trump_term.lower() in clean_headline.lower() for trump_term in ['trump', 'potus', 'president trump'])
-                                    # Improved summary: include headline and why it's good/bad
-                                    summary = f"{clean_headline}\n"
-                                    if affected_coins_analysis['positive_reason']:
-                                        summary += f"\nWhy good: {affected_coins_analysis['positive_reason']}"
-                                    if affected_coins_analysis['negative_reason']:
-                                        summary += f"\nWhy bad: {affected_coins_analysis['negative_reason']}"
-                                    breaking_news = {
-                                        'title': clean_headline,
-                                        'summary': summary.strip(),
-                                        'impact_analysis': impact_analysis,
-                                        'affected_coins': affected_coins_analysis['all_affected'],
-                                        'positive_impact_coins': affected_coins_analysis['positive_impact'],
-                                        'negative_impact_coins': affected_coins_analysis['negative_impact'],
-                                        'positive_reason': affected_coins_analysis['positive_reason'],
-                                        'negative_reason': affected_coins_analysis['negative_reason'],
-                                        'source_name': source_url.split('//')[1].split('/')[0],
-                                        'source_url': article_url,
-                                        'sentiment': sentiment_score,
-                                        'sentiment_text': sentiment_text,
-                                        'is_trump_related': is_trump_related
-                                    }
-                                    last_checked[source_url] = now
-                                    # If it's XRP or HBAR news, always send immediately
-                                    if any(coin in breaking_news['affected_coins'] for coin in ['XRP', 'HBAR']):
-                                        return breaking_news
-                                    # If it's Trump-related, give it higher priority
-                                    if is_trump_related:
-                                        return breaking_news
-                                    return breaking_news
-                        last_checked[source_url] = now
-            except Exception as e:
-                print(f"Error checking {source_url}: {e}")
-                last_checked[source_url] = now
+    due_sources = [
+        source_url for source_url in NEWS_SOURCES
+        if not (source_url in last_checked and now - last_checked[source_url] < timedelta(minutes=5))
+    ]
+    if not due_sources:
+        return []
+    
+    # Fetch all due sources at once and handle each one as soon as it arrives
+    session = get_news_session()
+    fetches = []
+    for source_url in due_sources:
+        if NEWS_FEEDS.get(source_url):
+            fetches.append(fetch_news_feed(session, source_url, NEWS_FEEDS[source_url]))
+        else:
+            fetches.append(fetch_news_source(session, source_url))
+    found = []
+    for next_source in asyncio.as_completed(fetches):
+        source_url, content, page_state = await next_source
+        last_checked[source_url] = now
+        if isinstance(content, list):
+            found.extend(find_breaking_news_in_feed(source_url, content))
+        elif content is not None:
+            found.extend(find_breaking_news_in_page(source_url, content))
+        news_source_cache[source_url] = page_state
+    return found
+
+def breaking_news_priority(breaking_news):
+    """Sort key for queued news: XRP/HBAR and Trump stories first, then by strength of sentiment"""
+    affected = breaking_news['affected_coins']
+    # Headlines naming no coin affect every supported coin, which doesn't make them XRP/HBAR news
+    coin_specific = set(affected) != set(SUPPORTED_COINS) and any(coin in affected for coin in ['XRP', 'HBAR'])
+    tier = 0 if coin_specific or breaking_news['is_trump_related'] else 1
+    return (tier, -abs(breaking_news['sentiment']))
+
+def queue_breaking_news(stories):
+    """Add detected stories to the breaking news queue"""
+    for breaking_news in stories:
+        heapq.heappush(breaking_news_queue, (breaking_news_priority(breaking_news), next(breaking_news_sequence), breaking_news))
+
+def pop_breaking_news():
+    """Take the most important queued story, or None if the queue is empty"""
+    if not breaking_news_queue:
+        return None
+    return heapq.heappop(breaking_news_queue)[-1]
+
+def find_breaking_news_in_feed(source_url, items):
+    """Find every new market-moving headline among a feed's new items"""
+    stories = []
+    for item in items:
+        breaking_news = build_breaking_news(source_url, item['title'], lambda item=item: urljoin(source_url, item['link'] or ''))
+        if breaking_news:
+            breaking_news['published_at'] = item['published']
+            stories.append(breaking_news)
+    return stories
+
+def find_breaking_news_in_page(source_url, html_content):
+    """Find every new market-moving headline on a fetched news page"""
+    # Parse the page once; matching and URL lookup then run on the compact index
+    page_index = index_page(html_content)
+    stories = []
+    for clean_headline, _ in page_index['headlines']:
+        breaking_news = build_breaking_news(
+            source_url, clean_headline,
+            lambda headline=clean_headline: find_article_url(page_index, headline, source_url)
+        )
+        if breaking_news:
+            stories.append(breaking_news)
+    return stories
+
+def build_breaking_news(source_url, clean_headline, get_article_url):
+    """Analyse a headline into a breaking news story, or None if it isn't new market-moving news"""
+    entity = match_market_mover(clean_headline)
+    if not entity:
+        return None
+    # Only send if not already sent
+    if clean_headline in sent_news:
         return None
+    if news_deduplicator.is_duplicate(clean_headline):
+        return None
+    sent_news.add(clean_headline)
+    article_url = get_article_url()
+    affected_coins_analysis = analyze_crypto_impact(clean_headline, entity)
+    sentiment_score = calculate_news_sentiment(clean_headline)
+    sentiment_text = get_sentiment_text(sentiment_score)
+    impact_analysis = generate_impact_analysis(clean_headline, entity, sentiment_score)
+    is_trump_related = any(trump_term.lower() in clean_headline.lower() for trump_term in ['trump', 'potus', 'president trump'])
+    # Improved summary: include headline and why it's good/bad
+    summary = f"{clean_headline}\n"
+    if affected_coins_analysis['positive_reason']:
+        summary += f"\nWhy good: {affected_coins_analysis['positive_reason']}"
+    if affected_coins_analysis['negative_reason']:
+        summary += f"\nWhy bad: {affected_coins_analysis['negative_reason']}"
+    breaking_news = {
+        'title': clean_headline,
+        'summary': summary.strip(),
+        'impact_analysis': impact_analysis,
+        'affected_coins': affected_coins_analysis['all_affected'],
+        'positive_impact_coins': affected_coins_analysis['positive_impact'],
+        'negative_impact_coins': affected_coins_analysis['negative_impact'],
+        'positive_reason': affected_coins_analysis['positive_reason'],
+        'negative_reason': affected_coins_analysis['negative_reason'],
+        'source_name': source_url.split('//')[1].split('/')[0],
+        'source_url': article_url,
+        'sentiment': sentiment_score,
+        'sentiment_text': sentiment_text,
+        'is_trump_related': is_trump_related
+    }
+    return breaking_news
 
 def analyze_crypto_impact(headline, mentioned_entity):
     """Analyze which cryptocurrencies will be positively or negatively impacted by the news"""
@@ -966,49 +1730,93 @@ def analyze_crypto_impact(headline, mentioned_entity):
     
     return result
 
-def find_article_url(html_content, headline, source_base_url):
-    """Find the actual article URL from the content based on headline match"""
+class NewsPageParser(HTMLParser):
+    """Single pass over a news page that collects headings and links with their hrefs"""
+
+    HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.headlines = []  # (headline, href) for every heading
+        self.links = []  # (link text, href) for every link
+        self._href = None
+        self._link_text = []
+        self._heading_text = None
+        self._heading_href = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            self._href = dict(attrs).get('href')
+            self._link_text = []
+            # A link inside a heading points at that heading's article
+            if self._heading_text is not None and self._heading_href is None:
+                self._heading_href = self._href
+        elif tag in self.HEADING_TAGS:
+            self._heading_text = []
+            # Headings are often wrapped in the article link
+            self._heading_href = self._href
+
+    def handle_endtag(self, tag):
+        if tag == 'a':
+            text = ' '.join(''.join(self._link_text).split())
+            if self._href and text:
+                self.links.append((text, self._href))
+            self._href = None
+        elif tag in self.HEADING_TAGS and self._heading_text is not None:
+            headline = ' '.join(''.join(self._heading_text).split())
+            if headline:
+                self.headlines.append((headline, self._heading_href))
+            self._heading_text = None
+            self._heading_href = None
+
+    def handle_data(self, data):
+        if self._heading_text is not None:
+            self._heading_text.append(data)
+        if self._href is not None:
+            self._link_text.append(data)
+
+def index_page(html_content):
+    """Parse a news page once into its (headline, href) pairs and links"""
+    parser = NewsPageParser()
+    try:
+        parser.feed(html_content)
+        parser.close()
+    except Exception as e:
+        print(f"Error indexing page: {e}")
+    return {'headlines': parser.headlines, 'links': parser.links}
+
+def match_market_mover(headline):
+    """Return the highest priority market mover mentioned in a headline, or None"""
+    if not MARKET_MOVER_PATTERN.search(headline):
+        return None
+    headline_lower = headline.lower()
+    for entity in MARKET_MOVERS:
+        if entity.lower() in headline_lower:
+            return entity
+    return None
+
+def find_article_url(page_index, headline, source_base_url):
+    """Find the actual article URL from the page index based on headline match"""
     try:
-        # Look for links with text similar to the headline
-        # This is a simplified approach - real implementation would need site-specific parsing
+        # Use the link attached to the headline itself when there is one
+        for indexed_headline, href in page_index['headlines']:
+            if indexed_headline == headline and href:
+                return urljoin(source_base_url, href)
         
-        # First, try to find links with headline text
+        # Otherwise look for links with text similar to the headline
         headline_words = headline.lower().split()
         significant_words = [word for word in headline_words if len(word) > 4][:3]  # Use up to 3 significant words
         
-        # Build a pattern to find links containing these words
         if significant_words:
-            word_pattern = '|'.join(significant_words)
-            link_pattern = re.compile(f'<a[^>]*href="([^"]*)"[^>]*>(?:[^<]*(?:{word_pattern})[^<]*)</a>', re.IGNORECASE)
-            matches = link_pattern.findall(html_content)
-            
-            if matches:
-                article_url = matches[0]
-                # If it's a relative URL, make it absolute
-                if article_url.startswith('/'):
-                    # Extract base domain from source_base_url
-                    domain = '/'.join(source_base_url.split('/')[:3])  # http(s)://domain.com
-                    article_url = f"{domain}{article_url}"
-                elif not article_url.startswith(('http://', 'https://')):
-                    article_url = f"{source_base_url.rstrip('/')}/{article_url.lstrip('/')}"
-                
-                return article_url
+            for text, href in page_index['links']:
+                text_lower = text.lower()
+                if any(word in text_lower for word in significant_words):
+                    return urljoin(source_base_url, href)
         
         # Fallback: try to find any news article link
-        news_link_pattern = re.compile(r'<a[^>]*href="([^"]*(?:article|news|story|post)[^"]*)"[^>]*>', re.IGNORECASE)
-        news_matches = news_link_pattern.findall(html_content)
-        
-        if news_matches:
-            article_url = news_matches[0]
-            # If it's a relative URL, make it absolute
-            if article_url.startswith('/'):
-                # Extract base domain from source_base_url
-                domain = '/'.join(source_base_url.split('/')[:3])  # http(s)://domain.com
-                article_url = f"{domain}{article_url}"
-            elif not article_url.startswith(('http://', 'https://')):
-                article_url = f"{source_base_url.rstrip('/')}/{article_url.lstrip('/')}"
-            
-            return article_url
+        for _, href in page_index['links']:
+            if any(part in href.lower() for part in ['article', 'news', 'story', 'post']):
+                return urljoin(source_base_url, href)
     
     except Exception as e:
         print(f"Error finding article URL: {e}")
@@ -1101,29 +1909,10 @@ def generate_impact_analysis(headline, entity, sentiment):
     else:
         return f"Significantly negative development that might trigger immediate selling."
 
-def get_crypto_price(symbol):
-    """Get current price for a cryptocurrency in USD"""
-    try:
-        url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}USDT"
-        r = requests.get(url)
-        return r.json()['price']
-    except Exception as e:
-        print(f"Error fetching price: {e}")
-        return None
-
 def convert_usd_to_gbp(usd_amount):
-    """Convert USD to GBP using current exchange rate"""
-    try:
-        # Try to get current exchange rate
-        url = "https://api.exchangerate-api.com/v4/latest/USD"
-        response = requests.get(url)
-        data = response.json()
-        gbp_rate = data["rates"]["GBP"]
-        return usd_amount * gbp_rate
-    except Exception as e:
-        print(f"Error fetching exchange rate: {e}")
-        # Fall back to default rate
-        return usd_amount * USD_TO_GBP_RATE
+    """Convert USD to GBP using the cached exchange rate"""
+    # Falls back to the last good rate, then USD_TO_GBP_RATE, if refreshes fail
+    return fx_service.convert(usd_amount, 'GBP')
 
 def get_technical_analysis(symbol):
     """Get technical analysis for a cryptocurrency using consistent market state"""
@@ -1368,10 +2157,10 @@ def get_crypto_news(symbol):
     else:
         return []
 
-def get_market_overview():
-    """Get market overview for all supported coins using the central market state"""
+def get_market_overview(coins=None):
+    """Get market overview for the given (default: all supported) coins using the central market state"""
     overview = {}
-    for coin in SUPPORTED_COINS:
+    for coin in coins if coins is not None else SUPPORTED_COINS:
         # Get consistent state from market manager
         state = market_manager.get_state(coin)
         
@@ -1427,4 +2216,12 @@ def check_for_breaking_news():
     return random.choice(breaking_news_items)
 
 if __name__ == "__main__":
-    bot.run(TOKEN) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Crypto Discord bot")
+    parser.add_argument('--shards', type=int, default=0, help="Run this many gateway shards across several processes")
+    parser.add_argument('--processes', type=int, default=0, help="Processes to spread the shards over (default: one per CPU, at most one per shard)")
+    args = parser.parse_args()
+    
+    if args.shards and BOT_ROLE != 'shard':
+        run_sharded(args.shards, args.processes or min(args.shards, os.cpu_count() or 1))
+    else:
+        bot.run(TOKEN) 
\ No newline at end of file
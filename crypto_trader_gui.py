@@ -13,6 +13,7 @@ from data_fetcher import DataFetcher
 from technical_analysis import TechnicalAnalyzer
 from sentiment_analysis import SentimentAnalyzer
 from signal_generator import SignalGenerator
+from signal_history import SignalHistory
 import config
 
 class CryptoTradingApp(QMainWindow):
@@ -27,6 +28,7 @@ class CryptoTradingApp(QMainWindow):
         self.technical_analyzer = TechnicalAnalyzer()
         self.sentiment_analyzer = SentimentAnalyzer()
         self.signal_generator = SignalGenerator()
+        self.signal_history = SignalHistory(config.DATABASE_FILE)
         
         # Setup UI
         self.setup_ui()
@@ -221,41 +223,25 @@ class CryptoTradingApp(QMainWindow):
             print(f"Error updating data: {str(e)}")
 
     def update_signals(self):
-        """Update trading signals table"""
+        """Update trading signals table from the latest stored signal of each symbol"""
         self.signals_table.setRowCount(0)
         
-        for symbol in config.SYMBOLS:
-            try:
-                # Get current price
-                current_price = self.data_fetcher.get_current_price(symbol)
-                
-                # Get historical data
-                df = self.data_fetcher.get_historical_klines(symbol, '1h')
-                
-                # Get technical indicators
-                rsi = self.technical_analyzer.calculate_rsi(df)
-                macd = self.technical_analyzer.calculate_macd(df)
-                
-                # Get news sentiment
-                news = self.data_fetcher.get_crypto_news(symbol)
-                news_sentiment = self.sentiment_analyzer.analyze_news(news)
-                
-                # Generate signal
-                signal = self.signal_generator.generate_signal(
-                    symbol, current_price, rsi, macd, news_sentiment
-                )
-                
-                if signal:
-                    row = self.signals_table.rowCount()
-                    self.signals_table.insertRow(row)
-                    self.signals_table.setItem(row, 0, QTableWidgetItem(symbol))
-                    self.signals_table.setItem(row, 1, QTableWidgetItem(signal['type']))
-                    self.signals_table.setItem(row, 2, QTableWidgetItem(f"${current_price:,.2f}"))
-                    self.signals_table.setItem(row, 3, QTableWidgetItem(f"{signal['confidence']:.2%}"))
-                    self.signals_table.setItem(row, 4, QTableWidgetItem(datetime.now().strftime("%H:%M:%S")))
-                    
-            except Exception as e:
-                print(f"Error updating signals for {symbol}: {str(e)}")
+        try:
+            # Signals are produced and stored by the analysis run (main.py), not recomputed here
+            latest_signals = self.signal_history.latest_per_symbol(config.SYMBOLS)
+        except Exception as e:
+            print(f"Error loading signals: {str(e)}")
+            return
+        
+        for signal in latest_signals:
+            row = self.signals_table.rowCount()
+            self.signals_table.insertRow(row)
+            self.signals_table.setItem(row, 0, QTableWidgetItem(signal['symbol']))
+            self.signals_table.setItem(row, 1, QTableWidgetItem(signal['recommendation']))
+            price = signal['current_price']
+            self.signals_table.setItem(row, 2, QTableWidgetItem(f"${price:,.2f}" if price is not None else "-"))
+            self.signals_table.setItem(row, 3, QTableWidgetItem(f"{signal['confidence']:.2%}"))
+            self.signals_table.setItem(row, 4, QTableWidgetItem(datetime.fromtimestamp(signal['timestamp']).strftime("%Y-%m-%d %H:%M:%S")))
 
     def update_chart(self, symbol):
         """Update price chart for selected symbol"""
@@ -1,30 +1,37 @@
 import pandas as pd
 from newsapi import NewsApiClient
-from datetime import datetime, timedelta
 import config
 import requests
 import time
 import json
-from functools import lru_cache
+import threading
+from news_ingestion import NewsIngestor
+from twitter_ingestion import TweetIngestor
+from candle_scheduler import TIMEFRAME_SECONDS, next_candle_close
 
 class DataFetcher:
     def __init__(self):
         # Initialize clients with error handling
         self.news_client = None
+        self.news_ingestor = None
         self.twitter_client = None
+        self.tweet_ingestor = None
         
         # CoinGecko API base URL
         self.coingecko_base_url = "https://api.coingecko.com/api/v3"
         self.last_request_time = 0
         self.min_request_interval = 6.0  # Increased to 6 seconds between requests
+        self.rate_limit_lock = threading.Lock()  # Symbols are fetched from several threads at once
         self.price_cache = {}
         self.price_cache_time = {}
         self.cache_duration = 60  # Cache prices for 60 seconds
+        self.klines_cache = {}  # (symbol, interval, lookback_days) -> (DataFrame, time the cached candle closes)
         
         # Try to initialize News API client
         try:
             if config.NEWS_API_KEY != "YOUR_NEWS_API_KEY":
                 self.news_client = NewsApiClient(api_key=config.NEWS_API_KEY)
+                self.news_ingestor = NewsIngestor(self.news_client, config.SYMBOLS)
                 print("Successfully connected to News API")
             else:
                 print("News API key not configured. Continuing without news data.")
@@ -38,19 +45,21 @@ class DataFetcher:
             auth = tweepy.OAuthHandler(config.TWITTER_API_KEY, config.TWITTER_API_SECRET)
             auth.set_access_token(config.TWITTER_ACCESS_TOKEN, config.TWITTER_ACCESS_TOKEN_SECRET)
             self.twitter_client = tweepy.API(auth)
+            self.tweet_ingestor = TweetIngestor(self.twitter_client)
             print("Successfully connected to Twitter API")
         except Exception as e:
             print("Twitter integration is not available. Continuing without Twitter data.")
 
     def _rate_limit(self):
         """Implement rate limiting for API calls"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            print(f"Rate limiting: waiting {sleep_time:.1f} seconds...")
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+        with self.rate_limit_lock:
+            current_time = time.time()
+            time_since_last_request = current_time - self.last_request_time
+            if time_since_last_request < self.min_request_interval:
+                sleep_time = self.min_request_interval - time_since_last_request
+                print(f"Rate limiting: waiting {sleep_time:.1f} seconds...")
+                time.sleep(sleep_time)
+            self.last_request_time = time.time()
 
     def _get_coin_id(self, symbol):
         """Convert trading symbol to CoinGecko coin ID"""
@@ -63,9 +72,13 @@ class DataFetcher:
         }
         return symbol_map.get(symbol, symbol.lower().replace('usdt', ''))
 
-    @lru_cache(maxsize=32)
     def get_historical_klines(self, symbol, interval, lookback_days=30):
-        """Fetch historical price data from CoinGecko with caching"""
+        """Fetch historical price data from CoinGecko, cached until the current candle closes"""
+        cache_key = (symbol, interval, lookback_days)
+        cached = self.klines_cache.get(cache_key)
+        if cached and time.time() < cached[1]:
+            return cached[0]
+        
         try:
             self._rate_limit()
             coin_id = self._get_coin_id(symbol)
@@ -101,6 +114,13 @@ class DataFetcher:
             # Forward fill missing values
             df.ffill(inplace=True)
             
+            # A run after the next candle close must see that candle, so the cache expires with it
+            if interval in TIMEFRAME_SECONDS:
+                expires_at = next_candle_close(time.time(), interval)
+            else:
+                expires_at = time.time() + self.cache_duration
+            self.klines_cache[cache_key] = (df, expires_at)
+            
             return df
             
         except Exception as e:
@@ -109,42 +129,26 @@ class DataFetcher:
 
     def get_crypto_news(self, symbol):
         """Fetch recent news articles about a cryptocurrency"""
-        if not self.news_client:
+        if not self.news_ingestor:
             print("News API is not available")
             return []
             
         try:
-            query = symbol.replace('USDT', '')  # Remove USDT from symbol
-            end_date = datetime.now()
-            start_date = end_date - timedelta(hours=config.NEWS_LOOKBACK_HOURS)
-            
-            news = self.news_client.get_everything(
-                q=query,
-                from_param=start_date.strftime('%Y-%m-%d'),
-                to=end_date.strftime('%Y-%m-%d'),
-                language='en',
-                sort_by='relevancy'
-            )
-            
-            return news['articles']
+            # Served from the shared cache, which queries NewsAPI for all symbols at once
+            return self.news_ingestor.get_articles(symbol)
         except Exception as e:
             print(f"Error fetching news for {symbol}: {str(e)}")
             return []
 
     def get_twitter_sentiment(self, symbol):
         """Fetch recent tweets about a cryptocurrency"""
-        if not self.twitter_client:
+        if not self.tweet_ingestor:
             return []
             
         try:
             query = symbol.replace('USDT', '')  # Remove USDT from symbol
-            tweets = self.twitter_client.search_tweets(
-                q=query,
-                lang='en',
-                count=100,
-                tweet_mode='extended'
-            )
-            return [tweet.full_text for tweet in tweets]
+            # Only tweets newer than the last seen since_id are fetched; older ones come from the window
+            return self.tweet_ingestor.get_tweets(query)
         except Exception as e:
             print(f"Error fetching tweets: {str(e)}")
             return []
@@ -185,4 +189,35 @@ class DataFetcher:
             return price
         except Exception as e:
             print(f"Error fetching current price for {symbol}: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    def get_current_prices(self, symbols):
+        """Get current prices for several cryptocurrencies with one request, filling the price cache"""
+        try:
+            coin_ids = {symbol: self._get_coin_id(symbol) for symbol in symbols}
+            self._rate_limit()
+            url = f"{self.coingecko_base_url}/simple/price"
+            params = {
+                'ids': ','.join(sorted(set(coin_ids.values()))),
+                'vs_currencies': 'usd'
+            }
+            
+            response = requests.get(url, params=params)
+            if response.status_code == 429:
+                print("Rate limit hit. Waiting 60 seconds before retrying...")
+                time.sleep(60)
+                return self.get_current_prices(symbols)
+            response.raise_for_status()
+            data = response.json()
+            
+            current_time = time.time()
+            prices = {}
+            for symbol, coin_id in coin_ids.items():
+                if coin_id in data and 'usd' in data[coin_id]:
+                    prices[symbol] = float(data[coin_id]['usd'])
+                    self.price_cache[symbol] = prices[symbol]
+                    self.price_cache_time[symbol] = current_time
+            return prices
+        except Exception as e:
+            print(f"Error fetching current prices: {str(e)}")
+            return {} 
\ No newline at end of file
@@ -0,0 +1,53 @@
+import threading
+import time
+import requests
+
+EXCHANGE_RATE_URL = "https://api.exchangerate-api.com/v4/latest/{base}"
+
+
+class FxRateService:
+    """Serve currency conversions from an in-memory rate table refreshed on a schedule"""
+
+    def __init__(self, base='USD', fallback_rates=None, timeout=5):
+        self.base = base
+        self.fallback_rates = dict(fallback_rates or {})
+        self.timeout = timeout
+        self.rates = {}  # Last known good table
+        self.updated_at = 0
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        """Fetch the full rate table, keeping the last good one if the request fails"""
+        try:
+            response = requests.get(EXCHANGE_RATE_URL.format(base=self.base), timeout=self.timeout)
+            response.raise_for_status()
+            rates = response.json()['rates']
+            with self.lock:
+                self.rates = rates
+                self.updated_at = time.time()
+            return True
+        except Exception as e:
+            print(f"Error fetching exchange rates: {e}")
+            return False
+
+    def get_rate(self, currency):
+        """Get the rate for a currency from memory, falling back to the configured default"""
+        if not self.updated_at:
+            # Only a lookup before the first scheduled refresh hits the API
+            if not self.refresh():
+                self.updated_at = -1  # Don't retry on every call, leave it to the schedule
+
+        rate = self.rates.get(currency)
+        if rate is None:
+            rate = self.fallback_rates.get(currency)
+        if rate is None:
+            raise KeyError(f"No exchange rate for {currency}")
+        return rate
+
+    def convert(self, amount, currency):
+        """Convert an amount in the base currency to another currency"""
+        return amount * self.get_rate(currency)
+
+    def convert_many(self, amount, currencies):
+        """Convert an amount into several currencies from the same cached table"""
+        return {currency: self.convert(amount, currency) for currency in currencies}
@@ -1,98 +1,354 @@
+import asyncio
+import functools
+import json
+import os
+import socket
 import time
-import schedule
+from datetime import datetime
+import numpy as np
+import pandas as pd
 from data_fetcher import DataFetcher
 from technical_analysis import TechnicalAnalyzer
 from sentiment_analysis import SentimentAnalyzer
 from signal_generator import SignalGenerator
+from analysis_pipeline import StagedPipeline, PipelineStage
+from candle_scheduler import CandleScheduler
+from signal_journal import SignalJournal
+from symbol_workers import SymbolWorkerPool
+from task_broker import open_broker
+from price_triggers import PriceMoveWatcher
 import config
 import sys
 
+def _to_json(value):
+    """Serialise task data and signals for the task broker"""
+    def convert(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError(f"Cannot serialise {type(value).__name__}")
+    return json.dumps(value, default=convert)
+
+def _data_to_json(data):
+    """Serialise a symbol's fetched data into the payload of its analysis task"""
+    df = data['df']
+    return _to_json({
+        'current_price': data['current_price'],
+        'klines': {
+            'index': df.index.asi8.tolist(),
+            'index_name': df.index.name,
+            'columns': {column: df[column].tolist() for column in df.columns}
+        },
+        'news': data['news'],
+        'tweets': data['tweets']
+    })
+
+def _data_from_json(symbol, text):
+    """Fetched data of a symbol, as handed to a worker with its task"""
+    payload = json.loads(text)
+    klines = payload['klines']
+    index = pd.DatetimeIndex(pd.to_datetime(klines['index'], unit='ns'), name=klines['index_name'])
+    return {
+        'symbol': symbol,
+        'current_price': payload['current_price'],
+        'df': pd.DataFrame(klines['columns'], index=index),
+        'news': payload['news'],
+        'tweets': payload['tweets']
+    }
+
+def _result_from_json(text):
+    """Signal sent back by a worker, with its timestamp as a datetime again, and the scores of the tweets"""
+    result = json.loads(text)
+    signal = result['signal']
+    signal['timestamp'] = datetime.fromisoformat(signal['timestamp'])
+    return signal, result['tweet_sentiments']
+
 class CryptoTradingSignals:
-    def __init__(self):
+    def __init__(self, fetch_data=True):
         print("Initializing Crypto Trading Signals...")
-        self.data_fetcher = DataFetcher()
+        # Distributed workers are handed their data, so they make no API calls and keep no ingestion state
+        self.data_fetcher = DataFetcher() if fetch_data else None
         self.technical_analyzer = TechnicalAnalyzer()
         self.sentiment_analyzer = SentimentAnalyzer()
         self.signal_generator = SignalGenerator()
+        self.journal = SignalJournal(config.DATABASE_FILE)
+        self.worker_pool = None
+        self.analyze_data = self.analyze_symbol_data
+        analysis_workers = config.PIPELINE_ANALYSIS_WORKERS
+        if config.ANALYSIS_PROCESSES > 0:
+            # Analysis moves to worker processes; fetching and emitting stay here
+            self.worker_pool = SymbolWorkerPool(config.SYMBOLS, config.ANALYSIS_PROCESSES)
+            self.analyze_data = self.worker_pool.analyze
+            # Each thread waits on one symbol's process, two per process keep them all busy
+            analysis_workers = 2 * config.ANALYSIS_PROCESSES
+        self.pipeline = StagedPipeline([
+            PipelineStage('fetch', lambda job: self.fetch_symbol_data(*job), workers=config.PIPELINE_FETCH_WORKERS, queue_size=len(config.SYMBOLS)),
+            PipelineStage('analysis', self.analyze_data, workers=analysis_workers, queue_size=config.PIPELINE_QUEUE_SIZE),
+            PipelineStage('emit', self.emit_signal, workers=1, queue_size=config.PIPELINE_QUEUE_SIZE)
+        ])
         print("Initialization complete!")
 
-    def analyze_symbol(self, symbol):
+    def fetch_symbol_data(self, symbol, timeframe='1h'):
+        """Fetch everything needed to analyze a symbol, or None if the market data is unavailable"""
+        # Get current price
+        try:
+            current_price = self.data_fetcher.get_current_price(symbol)
+            print(f"{symbol} current price: ${current_price:.2f}")
+        except Exception as e:
+            print(f"Could not get current price for {symbol}: {str(e)}")
+            return None
+
+        # Get historical data
+        try:
+            df = self.data_fetcher.get_historical_klines(symbol, timeframe, lookback_days=30)
+            print(f"Historical data for {symbol} retrieved successfully")
+        except Exception as e:
+            print(f"Could not get historical data for {symbol}: {str(e)}")
+            return None
+
+        # Get news and tweets
+        news = self.data_fetcher.get_crypto_news(symbol)
+        tweets = self.data_fetcher.get_twitter_sentiment(symbol)
+        print(f"Retrieved {len(news)} news articles and {len(tweets)} tweets for {symbol}")
+
+        return {
+            'symbol': symbol,
+            'current_price': current_price,
+            'df': df,
+            'news': news,
+            'tweets': tweets
+        }
+
+    def analyze_symbol_data(self, data):
+        """Run technical and sentiment analysis on fetched data and generate the signal"""
+        # Generate technical analysis (on a copy, the klines cache hands out the same frame each time)
+        technical_recommendation = self.technical_analyzer.get_buy_recommendation(data['df'].copy())
+
+        # Generate sentiment analysis
+        sentiment_recommendation = self.sentiment_analyzer.get_sentiment_recommendation(data['news'], data['tweets'])
+
+        # Generate final signal
+        signal = self.signal_generator.generate_signal(
+            technical_recommendation,
+            sentiment_recommendation,
+            data['current_price']
+        )
+        return data['symbol'], signal
+
+    def emit_signal(self, result):
+        """Report a generated signal and add it to the journal"""
+        symbol, signal = result
+        self.journal.record(symbol, signal)
+
+        # Print signal if it's a buy recommendation
+        if signal['recommendation'] == 'BUY':
+            message = self.signal_generator.format_signal_message(signal, symbol)
+            print(message)
+        else:
+            print(f"No buy signal for {symbol} at this time")
+        return result
+
+    def analyze_symbol(self, symbol, timeframe='1h'):
         """Analyze a single cryptocurrency symbol"""
         try:
             print(f"\nAnalyzing {symbol}...")
-            
-            # Get current price
-            try:
-                current_price = self.data_fetcher.get_current_price(symbol)
-                print(f"Current price: ${current_price:.2f}")
-            except Exception as e:
-                print(f"Could not get current price for {symbol}: {str(e)}")
-                return
-            
-            # Get historical data
-            try:
-                df = self.data_fetcher.get_historical_klines(symbol, '1h', lookback_days=30)
-                print("Historical data retrieved successfully")
-            except Exception as e:
-                print(f"Could not get historical data for {symbol}: {str(e)}")
+            data = self.fetch_symbol_data(symbol, timeframe)
+            if data is None:
                 return
-            
-            # Get news and tweets
-            news = self.data_fetcher.get_crypto_news(symbol)
-            tweets = self.data_fetcher.get_twitter_sentiment(symbol)
-            print(f"Retrieved {len(news)} news articles and {len(tweets)} tweets")
-            
-            # Generate technical analysis
-            technical_recommendation = self.technical_analyzer.get_buy_recommendation(df)
-            
-            # Generate sentiment analysis
-            sentiment_recommendation = self.sentiment_analyzer.get_sentiment_recommendation(news, tweets)
-            
-            # Generate final signal
-            signal = self.signal_generator.generate_signal(
-                technical_recommendation,
-                sentiment_recommendation,
-                current_price
-            )
-            
-            # Print signal if it's a buy recommendation
-            if signal['recommendation'] == 'BUY':
-                message = self.signal_generator.format_signal_message(signal, symbol)
-                print(message)
-            else:
-                print(f"No buy signal for {symbol} at this time")
-                
+            self.emit_signal(self.analyze_data(data))
+            self.journal.flush()
         except Exception as e:
             print(f"Error analyzing {symbol}: {str(e)}")
 
-    def run_analysis(self):
-        """Run analysis for all configured symbols"""
-        print(f"\nRunning analysis at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        for symbol in config.SYMBOLS:
-            self.analyze_symbol(symbol)
+    def run_analysis(self, timeframe='1h'):
+        """Run analysis for all configured symbols.
+
+        Symbols go through a fetch -> analysis -> emit pipeline, so analysis
+        of one symbol overlaps with fetching the others.
+        """
+        print(f"\nRunning {timeframe} analysis at {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        started = time.time()
+
+        # One request prices every symbol, leaving the rate limited slots for the klines
+        self.data_fetcher.get_current_prices(config.SYMBOLS)
+
+        results = self.pipeline.run([(symbol, timeframe) for symbol in config.SYMBOLS])
+        # The whole cycle's signals go to the database in a single commit, off this thread
+        self.journal.flush()
+        print(f"Analyzed {len(results)} of {len(config.SYMBOLS)} symbols in {time.time() - started:.1f} seconds")
+
+    def run_distributed_analysis(self, broker, timeframe='1h'):
+        """Run analysis for all configured symbols on the workers attached to broker.
+
+        Every symbol's data is fetched here, so the CoinGecko rate limit, the
+        NewsAPI quota and the tweet cursors stay with this one process however
+        many workers there are. Each symbol's task is published with its data
+        as soon as that is fetched, and each result is emitted here as it
+        comes back, so every signal still lands in the coordinator's journal.
+        """
+        cycle = f"{timeframe}-{time.strftime('%Y%m%d-%H%M%S')}"
+        print(f"\nPublishing {timeframe} analysis cycle {cycle} at {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        started = time.time()
+        broker.purge(config.BROKER_RETENTION_HOURS * 60 * 60)
+
+        # One request prices every symbol, leaving the rate limited slots for the klines
+        self.data_fetcher.get_current_prices(config.SYMBOLS)
+
+        published = {}  # symbol -> fetched data, whose tweets get the scores the worker sends back
+
+        def publish(data):
+            broker.publish(cycle, [data['symbol']], timeframe, {data['symbol']: _data_to_json(data)})
+            published[data['symbol']] = data
+            return data
+
+        StagedPipeline([
+            PipelineStage('fetch', lambda job: self.fetch_symbol_data(*job), workers=config.PIPELINE_FETCH_WORKERS, queue_size=len(config.SYMBOLS)),
+            PipelineStage('publish', publish, workers=1, queue_size=config.PIPELINE_QUEUE_SIZE)
+        ]).run([(symbol, timeframe) for symbol in config.SYMBOLS])
+
+        last_seen = 0
+        finished = 0
+        analyzed = 0
+        while finished < len(published):
+            if time.time() - started > config.BROKER_CYCLE_TIMEOUT:
+                print(f"Stopped waiting for cycle {cycle}, tasks by status: {broker.counts(cycle)}")
+                break
+            rows = broker.results(cycle, last_seen)
+            for finish_seq, symbol, status, result, error in rows:
+                last_seen = finish_seq
+                finished += 1
+                if status == 'failed':
+                    print(f"Could not analyze {symbol}: {error}")
+                    continue
+                try:
+                    signal, tweet_sentiments = _result_from_json(result)
+                    for tweet, sentiment in zip(published[symbol]['tweets'], tweet_sentiments):
+                        if sentiment is not None:
+                            tweet['sentiment'] = sentiment
+                    self.emit_signal((symbol, signal))
+                    analyzed += 1
+                except Exception as e:
+                    print(f"Error emitting signal for {symbol}: {str(e)}")
+            if not rows:
+                time.sleep(config.BROKER_POLL_INTERVAL)
+
+        self.journal.flush()
+        print(f"Analyzed {analyzed} of {len(config.SYMBOLS)} symbols in {time.time() - started:.1f} seconds")
+
+    def run_worker(self, broker, worker_id=None):
+        """Claim analysis tasks from broker and send back their signals, until interrupted.
 
-def main():
+        Tasks come with their data, so workers never call the market, news or
+        Twitter APIs, and keep nothing between tasks that another worker would
+        need. A task whose worker dies is picked up by another one once its
+        lease runs out.
+        """
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        print(f"Worker {worker_id} waiting for tasks")
+        while True:
+            tasks = broker.claim(worker_id)
+            if not tasks:
+                time.sleep(config.BROKER_POLL_INTERVAL)
+                continue
+
+            task_id, cycle, symbol, timeframe, attempt, payload = tasks[0]
+            print(f"\nAnalyzing {symbol} for cycle {cycle} (attempt {attempt})...")
+            try:
+                if payload is None:
+                    broker.fail(task_id, worker_id, "task published without its data")
+                    continue
+                data = _data_from_json(symbol, payload)
+                _, signal = self.analyze_data(data)
+                # Tweet scores go back so the coordinator's rolling window keeps them
+                result = _to_json({'signal': signal, 'tweet_sentiments': [tweet.get('sentiment') for tweet in data['tweets']]})
+                if not broker.complete(task_id, worker_id, result):
+                    print(f"Lease on {symbol} ran out before the analysis finished, result dropped")
+            except Exception as e:
+                print(f"Error analyzing {symbol}: {str(e)}")
+                broker.fail(task_id, worker_id, str(e))
+
+    def close(self):
+        """Finish writing the signal journal and stop any analysis processes"""
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+        self.journal.close()
+
+def main(mode='local'):
+    """Run the application.
+
+    'local' analyses every symbol here after each candle close, 'watch' only
+    the symbols whose price moves, and 'coordinator' hands the symbols to
+    'worker' processes.
+    """
+    app = None
     try:
-        app = CryptoTradingSignals()
+        app = CryptoTradingSignals(fetch_data=(mode != 'worker'))
+        
+        run_analysis = app.run_analysis
+        if mode in ('coordinator', 'worker'):
+            broker = open_broker(
+                config.BROKER_URL,
+                lease_seconds=config.BROKER_LEASE_SECONDS,
+                max_attempts=config.BROKER_MAX_ATTEMPTS,
+                retry_delay=config.BROKER_RETRY_DELAY
+            )
+            if mode == 'worker':
+                print("\nCrypto Trading Signals worker started...")
+                print("Press Ctrl+C to exit")
+                app.run_worker(broker)
+                return
+            run_analysis = functools.partial(app.run_distributed_analysis, broker)
         
         # Run initial analysis
-        app.run_analysis()
+        run_analysis()
         
-        # Schedule regular analysis
-        schedule.every(1).hours.do(app.run_analysis)
+        if mode == 'watch':
+            # Each symbol is re-analysed on its own when its price moves or its candle closes
+            watcher = PriceMoveWatcher(
+                config.SYMBOLS,
+                app.data_fetcher.get_current_prices,
+                functools.partial(app.analyze_symbol, timeframe=config.PRICE_WATCH_TIMEFRAME),
+                timeframe=config.PRICE_WATCH_TIMEFRAME,
+                threshold=config.PRICE_MOVE_THRESHOLD,
+                poll_interval=config.PRICE_WATCH_INTERVAL,
+                debounce=config.PRICE_TRIGGER_DEBOUNCE,
+                min_interval=config.PRICE_TRIGGER_MIN_INTERVAL,
+                close_delay=config.SCHEDULE_CLOSE_DELAY,
+                max_concurrent=config.PRICE_TRIGGER_CONCURRENCY
+            )
+            print("\nCrypto Trading Signals watching prices...")
+            print("Press Ctrl+C to exit")
+            asyncio.run(watcher.run())
+            return
+        
+        # Schedule an analysis right after every candle close
+        scheduler = CandleScheduler(close_delay=config.SCHEDULE_CLOSE_DELAY, jitter=config.SCHEDULE_JITTER)
+        for timeframe in config.ANALYSIS_TIMEFRAMES:
+            scheduler.add_job(f"{timeframe} analysis", timeframe, functools.partial(run_analysis, timeframe), overlap=config.SCHEDULE_OVERLAP)
         
         print("\nCrypto Trading Signals application started...")
         print("Press Ctrl+C to exit")
         
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+        asyncio.run(scheduler.run())
             
     except KeyboardInterrupt:
         print("\nApplication stopped by user")
     except Exception as e:
         print(f"\nFatal error: {str(e)}")
         sys.exit(1)
+    finally:
+        if app is not None:
+            app.close()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # python main.py history ... queries stored signals instead of running the analysis
+    if len(sys.argv) > 1 and sys.argv[1] == 'history':
+        import signal_history
+        sys.exit(signal_history.main(sys.argv[2:]))
+    # python main.py coordinator / python main.py worker share the analysis out through the task broker,
+    # python main.py watch re-analyses symbols as their prices move
+    if len(sys.argv) > 1 and sys.argv[1] in ('coordinator', 'worker', 'watch'):
+        main(sys.argv[1])
+    else:
+        main() 
\ No newline at end of file
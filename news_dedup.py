@@ -0,0 +1,326 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Defaults are kept here (not in config) so the Discord bot can use this module
+# without pulling in the analysis dependencies
+DEFAULT_MAX_FINGERPRINTS = 5000
+DEFAULT_MAX_DISTANCE = 8
+DEFAULT_MAX_HEADLINE_AGE = 24 * 3600
+FINGERPRINT_BITS = 64
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class NewsDeduplicator:
+    """Collapse near-duplicate news stories using SimHash fingerprints"""
+
+    def __init__(self, max_fingerprints=DEFAULT_MAX_FINGERPRINTS, max_distance=DEFAULT_MAX_DISTANCE, shingle_size=5):
+        self.max_fingerprints = max_fingerprints
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+
+        # Fingerprint -> cached value (e.g. sentiment score), oldest first
+        self.fingerprints = OrderedDict()
+
+        # Split the fingerprint into max_distance + 1 bands. Two fingerprints within
+        # max_distance bits of each other must agree exactly on at least one band,
+        # so candidates can be looked up without comparing against every entry.
+        self.band_count = max_distance + 1
+        self.band_width = FINGERPRINT_BITS // self.band_count
+        self.band_mask = (1 << self.band_width) - 1
+        self.bands = {}
+
+        # Fingerprint -> content words of the text it was taken from
+        self.words = {}
+
+        # Sentiment analysis may run on several worker threads sharing one index
+        self.lock = threading.RLock()
+
+    def fingerprint(self, text):
+        """Calculate a 64-bit SimHash of the character shingles in a text"""
+        # Character shingles hold up better than word shingles on short headlines,
+        # where one changed word would otherwise alter most of the features
+        normalized = ' '.join(WORD_PATTERN.findall((text or '').lower()))
+        if len(normalized) > self.shingle_size:
+            shingles = [normalized[i:i + self.shingle_size] for i in range(len(normalized) - self.shingle_size + 1)]
+        else:
+            shingles = [normalized]
+
+        counts = [0] * FINGERPRINT_BITS
+        for shingle in shingles:
+            # Stable digest so fingerprints don't change between processes
+            value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+            for bit in range(FINGERPRINT_BITS):
+                if value >> bit & 1:
+                    counts[bit] += 1
+                else:
+                    counts[bit] -= 1
+
+        fingerprint = 0
+        for bit, count in enumerate(counts):
+            if count > 0:
+                fingerprint |= 1 << bit
+        return fingerprint
+
+    def _band_keys(self, fingerprint):
+        return [(band, (fingerprint >> (band * self.band_width)) & self.band_mask) for band in range(self.band_count)]
+
+    def _same_story(self, candidate, words):
+        # On short texts a few bits cover an antonym or a changed price, so the words have the last say
+        return words is None or not headlines_conflict(words, self.words.get(candidate, words))
+
+    def lookup(self, fingerprint, words=None):
+        """Return the stored fingerprint that is a near-duplicate of this one, or None.
+
+        With the text's words (headline_words) given, a candidate whose words
+        conflict with them is not a near-duplicate, however close it is.
+        """
+        if fingerprint in self.fingerprints and self._same_story(fingerprint, words):
+            return fingerprint
+        for key in self._band_keys(fingerprint):
+            for candidate in self.bands.get(key, ()):
+                if bin(candidate ^ fingerprint).count('1') <= self.max_distance and self._same_story(candidate, words):
+                    return candidate
+        return None
+
+    def remember(self, fingerprint, value=None, words=None):
+        """Store a fingerprint, evicting the oldest entries once the index is full"""
+        if fingerprint in self.fingerprints:
+            self.fingerprints.move_to_end(fingerprint)
+            self.fingerprints[fingerprint] = value
+            if words is not None:
+                self.words[fingerprint] = words
+            return
+
+        self.fingerprints[fingerprint] = value
+        if words is not None:
+            self.words[fingerprint] = words
+        for key in self._band_keys(fingerprint):
+            self.bands.setdefault(key, set()).add(fingerprint)
+
+        while len(self.fingerprints) > self.max_fingerprints:
+            oldest, _ = self.fingerprints.popitem(last=False)
+            self.words.pop(oldest, None)
+            for key in self._band_keys(oldest):
+                members = self.bands.get(key)
+                if members is not None:
+                    members.discard(oldest)
+                    if not members:
+                        del self.bands[key]
+
+    def is_duplicate(self, text):
+        """Check whether a text was already seen, recording it if not"""
+        fingerprint = self.fingerprint(text)
+        words = headline_words(text)
+        with self.lock:
+            match = self.lookup(fingerprint, words)
+            if match is not None:
+                self.fingerprints.move_to_end(match)
+                return True
+            self.remember(fingerprint, words=words)
+            return False
+
+    def score_clusters(self, texts, scorer):
+        """Score each cluster of near-duplicate texts once, in order of first appearance.
+
+        Scores are kept in the fingerprint index, so a story that was already
+        scored in an earlier cycle is not scored again.
+        """
+        with self.lock:
+            scores = []
+            batch_clusters = set()
+            for text in texts:
+                fingerprint = self.fingerprint(text)
+                words = headline_words(text)
+                match = self.lookup(fingerprint, words)
+                if match is not None and match in batch_clusters:
+                    continue  # Another copy of a story already counted in this batch
+
+                if match is not None and self.fingerprints[match] is not None:
+                    score = self.fingerprints[match]
+                    self.fingerprints.move_to_end(match)
+                else:
+                    score = scorer(text)
+                    if match is None:
+                        match = fingerprint
+                    self.remember(match, score, words)
+
+                batch_clusters.add(match)
+                scores.append(score)
+            return scores
+
+
+# Words that carry no meaning when comparing two headlines
+HEADLINE_STOPWORDS = {
+    'a', 'an', 'the', 'to', 'of', 'in', 'on', 'for', 'at', 'by', 'as', 'and', 'or', 'with', 'is', 'are',
+    'be', 'will', 'its', 's', 'says', 'said', 'after', 'amid', 'new', 'now', 'just', 'report', 'reports'
+}
+
+# Headlines that differ in one word from each side are opposite stories, not copies of one
+HEADLINE_UP_WORDS = {
+    'high', 'higher', 'rise', 'rising', 'rose', 'gain', 'surge', 'surging', 'jump', 'soar', 'rally', 'climb',
+    'up', 'above', 'bullish', 'inflow', 'buy', 'approve', 'approved', 'win', 'won', 'pump', 'spike'
+}
+HEADLINE_DOWN_WORDS = {
+    'low', 'lower', 'fall', 'falling', 'fell', 'drop', 'plunge', 'crash', 'tumble', 'slump', 'sink', 'slide',
+    'dip', 'down', 'below', 'bearish', 'outflow', 'sell', 'reject', 'rejected', 'deny', 'denied', 'lose', 'lost',
+    'loss', 'dump'
+}
+
+# Assets under their name and ticker, folded to one word so 'Hedera' and 'HBAR' still match
+HEADLINE_ASSET_ALIASES = {
+    'btc': 'bitcoin', 'ether': 'ethereum', 'eth': 'ethereum', 'sol': 'solana', 'hedera': 'hbar',
+    'ada': 'cardano', 'doge': 'dogecoin', 'ltc': 'litecoin', 'avax': 'avalanche', 'trx': 'tron',
+    'matic': 'polygon', 'usdt': 'tether', 'shib': 'shiba'
+}
+# Assets, issuers, exchanges and regulators: headlines differing by one of them are about different things
+HEADLINE_NAME_WORDS = set(HEADLINE_ASSET_ALIASES.values()) | {
+    'xrp', 'ripple', 'bnb', 'polkadot', 'chainlink', 'usdc', 'stellar', 'xlm', 'monero', 'sui', 'aptos',
+    'blackrock', 'fidelity', 'grayscale', 'vaneck', 'invesco', 'bitwise', 'franklin', 'ark', '21shares',
+    'binance', 'coinbase', 'kraken', 'okx', 'bybit', 'robinhood', 'microstrategy', 'strategy', 'tesla',
+    'sec', 'cftc', 'fed', 'ecb', 'treasury'
+}
+
+# '$1bn', '1 billion' and '$1,000,000,000' are the same number
+HEADLINE_MAGNITUDES = {
+    'k': 10 ** 3, 'thousand': 10 ** 3, 'm': 10 ** 6, 'mn': 10 ** 6, 'million': 10 ** 6,
+    'b': 10 ** 9, 'bn': 10 ** 9, 'billion': 10 ** 9, 't': 10 ** 12, 'tn': 10 ** 12, 'trillion': 10 ** 12
+}
+HEADLINE_WORD_PATTERN = re.compile(r"(\d+(?:\.\d+)?)([a-z]*)|[a-z0-9]+")
+
+# A trailing ' - Reuters' or ' | CoinDesk' naming the outlet
+HEADLINE_SOURCE_PATTERN = re.compile(r'\s+[-|–—]\s+\S+(?:\s+\S+){0,2}\s*$')
+
+
+def _number_word(number, magnitude):
+    value = float(number) * HEADLINE_MAGNITUDES.get(magnitude, 1)
+    return str(int(value)) if value == int(value) else str(value)
+
+
+def headline_words(text):
+    """Content words of a headline, without a trailing ' - Source' or ' | Source'.
+
+    Plurals are folded, asset tickers become the asset's name and amounts
+    like '$1.5bn' or '1.5 billion' become plain numbers.
+    """
+    text = HEADLINE_SOURCE_PATTERN.sub('', text or '')
+    # Thousands separators are dropped so $60,000 stays one word
+    tokens = list(HEADLINE_WORD_PATTERN.finditer(text.lower().replace(',', '')))
+    words = set()
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        position += 1
+        number, suffix = token.group(1), token.group(2)
+        if number is not None and (not suffix or suffix in HEADLINE_MAGNITUDES):
+            if not suffix and position < len(tokens) and tokens[position].group(0) in HEADLINE_MAGNITUDES:
+                suffix = tokens[position].group(0)
+                position += 1
+            words.add(_number_word(number, suffix))
+            continue
+
+        word = token.group(0)
+        if word in HEADLINE_STOPWORDS:
+            continue
+        if word.endswith('sses'):
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        words.add(HEADLINE_ASSET_ALIASES.get(word, word))
+    return words
+
+
+def headlines_conflict(words, other):
+    """Whether two headlines' words show different stories, however much else they share.
+
+    They do when the words only one of them has include a number or a
+    name (a price, an amount, another coin or company), or words pointing
+    in opposite directions (high/low, approves/rejects, inflows/outflows).
+    """
+    only_here, only_there = words - other, other - words
+    for word in only_here | only_there:
+        if word in HEADLINE_NAME_WORDS or word[0].isdigit():
+            return True
+    return bool((only_here & HEADLINE_UP_WORDS and only_there & HEADLINE_DOWN_WORDS) or
+                (only_here & HEADLINE_DOWN_WORDS and only_there & HEADLINE_UP_WORDS))
+
+
+class HeadlineDeduplicator:
+    """Recognise reworded copies of a headline seen in the last max_age seconds.
+
+    SimHash needs more text than a headline: on a handful of words a
+    one-word antonym moves the fingerprint less than a rewording does. This
+    compares the content words of headlines instead, and never matches two
+    that differ by a number, a name or words pointing in opposite directions
+    (see headlines_conflict).
+
+    A story is remembered from the first time it was seen, so one that keeps
+    coming back is alerted again once max_age has passed.
+    """
+
+    def __init__(self, max_headlines=DEFAULT_MAX_FINGERPRINTS, min_similarity=0.6, max_age=DEFAULT_MAX_HEADLINE_AGE):
+        self.max_headlines = max_headlines
+        self.min_similarity = min_similarity  # Shared words over all words of the two headlines
+        self.max_age = max_age
+        self.headlines = OrderedDict()  # id -> (word set, first seen), oldest first
+        self.index = {}  # word -> ids of headlines containing it
+        self.next_id = 0
+        self.lock = threading.RLock()
+
+    def _matches(self, words, other):
+        if len(words & other) / len(words | other) < self.min_similarity:
+            return False
+        return not headlines_conflict(words, other)
+
+    def lookup(self, words):
+        """Id of a stored headline that is a copy of one with these words, or None"""
+        candidates = set()
+        for word in words:
+            candidates.update(self.index.get(word, ()))
+        for headline_id in candidates:
+            if self._matches(words, self.headlines[headline_id][0]):
+                return headline_id
+        return None
+
+    def _forget_oldest(self):
+        oldest, (oldest_words, _) = self.headlines.popitem(last=False)
+        for word in oldest_words:
+            members = self.index.get(word)
+            if members is not None:
+                members.discard(oldest)
+                if not members:
+                    del self.index[word]
+
+    def expire(self, now=None):
+        """Forget headlines first seen more than max_age seconds ago"""
+        cutoff = (time.time() if now is None else now) - self.max_age
+        while self.headlines and next(iter(self.headlines.values()))[1] < cutoff:
+            self._forget_oldest()
+
+    def remember(self, words, now=None):
+        """Store a headline's words, evicting the oldest once the index is full"""
+        headline_id = self.next_id
+        self.next_id += 1
+        self.headlines[headline_id] = (words, time.time() if now is None else now)
+        for word in words:
+            self.index.setdefault(word, set()).add(headline_id)
+
+        while len(self.headlines) > self.max_headlines:
+            self._forget_oldest()
+
+    def is_duplicate(self, text, now=None):
+        """Check whether a headline was already seen, recording it if not"""
+        words = headline_words(text)
+        if not words:
+            return False
+        if now is None:
+            now = time.time()
+        with self.lock:
+            self.expire(now)
+            if self.lookup(words) is not None:
+                return True
+            self.remember(words, now)
+            return False
@@ -0,0 +1,123 @@
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def _local_name(tag):
+    """Tag name without its XML namespace, so RSS and Atom elements match the same way"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_feed_date(text):
+    """Parse an RSS (RFC 822) or Atom (ISO 8601) date into a Unix timestamp, or None"""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def read_feed_item(element):
+    """Pull the guid, title, link and publish time out of an RSS <item> or Atom <entry>"""
+    item = {'guid': None, 'title': None, 'link': None, 'published': None}
+    for child in element:
+        name = _local_name(child.tag)
+        text = (child.text or '').strip()
+        if name == 'title':
+            item['title'] = ' '.join(text.split())
+        elif name == 'link':
+            # RSS puts the URL in the text, Atom in href (skipping enclosures, replies and so on)
+            href = child.get('href')
+            if href is None:
+                item['link'] = item['link'] or text
+            elif child.get('rel', 'alternate') == 'alternate':
+                item['link'] = href
+        elif name in ('guid', 'id'):
+            item['guid'] = text
+        elif name in ('pubDate', 'published', 'date') or (name == 'updated' and item['published'] is None):
+            item['published'] = parse_feed_date(text)
+    item['guid'] = item['guid'] or item['link'] or item['title']
+    return item
+
+
+class FeedStream:
+    """Incrementally parse one fetch of a feed, returning only items not seen before.
+
+    Feeds list their newest items first, so once an already seen item turns
+    up the rest of the document is old and the caller can stop reading.
+
+    The first complete fetch of a feed only seeds its cursor: what a feed
+    already lists when the bot starts watching it is not breaking news.
+    """
+
+    def __init__(self, cursor, min_published, max_guids):
+        self.parser = ET.XMLPullParser(events=('end',))
+        self.cursor = cursor
+        self.seeding = not cursor['seeded']
+        self.opened = time.time()
+        self.min_published = min_published
+        self.max_guids = max_guids
+        self.reached_seen = False
+
+    def feed(self, chunk):
+        """Parse the next chunk of the document and return the new items it completed"""
+        self.parser.feed(chunk)
+        return self._read_items()
+
+    def close(self):
+        """Finish the document and return any remaining new items"""
+        self.parser.close()
+        items = self._read_items()
+        # Seeded only once the whole document was read, so an interrupted first fetch seeds again
+        self.cursor['seeded'] = True
+        return items
+
+    def _read_items(self):
+        items = []
+        for _, element in self.parser.read_events():
+            if _local_name(element.tag) not in ('item', 'entry'):
+                continue
+            item = read_feed_item(element)
+            element.clear()  # Parsed items are dropped so memory stays flat however long the feed is
+            if not item['guid'] or not item['title']:
+                continue
+            # Only the GUIDs decide what is new: a publish time can be skewed or in the future
+            published = item['published']
+            if item['guid'] in self.cursor['guids']:
+                # A future dated item stays on top of the feed, so newer ones can still follow it.
+                # While seeding, the rest of the document still has to be recorded
+                if not self.seeding and (published is None or published <= self.opened):
+                    self.reached_seen = True
+                continue
+            if published is not None and published < self.min_published:
+                continue
+            self.cursor['guids'][item['guid']] = published
+            if len(self.cursor['guids']) > self.max_guids:
+                self.cursor['guids'].popitem(last=False)
+            if not self.seeding:
+                items.append(item)
+        return items
+
+
+class FeedReader:
+    """Remember the GUIDs seen in each feed between fetches"""
+
+    def __init__(self, max_age_seconds=12 * 3600, max_guids=500):
+        self.max_age_seconds = max_age_seconds  # Items older than this are never news
+        self.max_guids = max_guids  # GUIDs kept per feed, well beyond a feed's length
+        self.cursors = {}  # feed url -> {'seeded': first fetch done, 'guids': guid -> publish timestamp}
+
+    def open(self, feed_url):
+        """Start parsing a new fetch of a feed"""
+        cursor = self.cursors.setdefault(feed_url, {'seeded': False, 'guids': OrderedDict()})
+        return FeedStream(cursor, time.time() - self.max_age_seconds, self.max_guids)
@@ -0,0 +1,182 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import config
+
+
+class NewsIngestor:
+    """Fetch news for all symbols with a few combined NewsAPI queries and route articles locally"""
+
+    def __init__(self, news_client, symbols, cache_ttl=None, lookback_hours=None, max_query_length=None,
+                 max_requests_per_query=None):
+        self.news_client = news_client
+        self.cache_ttl = cache_ttl if cache_ttl is not None else config.NEWS_CACHE_TTL
+        self.lookback_hours = lookback_hours if lookback_hours is not None else config.NEWS_LOOKBACK_HOURS
+        self.max_query_length = max_query_length if max_query_length is not None else config.NEWS_QUERY_MAX_LENGTH
+        self.max_requests_per_query = max_requests_per_query if max_requests_per_query is not None else config.NEWS_MAX_REQUESTS_PER_QUERY
+
+        self.symbols = []
+        self.patterns = {}
+        self.articles = {}  # symbol -> OrderedDict of url -> article
+        for symbol in symbols:
+            self._add_symbol(symbol)
+
+        self.last_fetch_time = 0
+        self.last_published_at = None  # Newest publishedAt seen, as returned by NewsAPI
+        self.gaps = []  # (query, from, to) windows whose articles were only partly fetched
+        self.lock = threading.RLock()  # Symbols may be fetched from several threads at once
+
+    def _get_keywords(self, symbol):
+        """Search terms for a symbol: its ticker plus the coin name if known"""
+        keywords = [symbol.replace('USDT', '')]
+        name = config.COIN_NAMES.get(symbol)
+        if name:
+            keywords.append(name)
+        return keywords
+
+    def _add_symbol(self, symbol):
+        keywords = self._get_keywords(symbol)
+        self.symbols.append(symbol)
+        self.patterns[symbol] = re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in keywords) + r')\b', re.IGNORECASE)
+        self.articles[symbol] = OrderedDict()
+
+    def _build_queries(self, symbols):
+        """Combine the keywords of all symbols into as few OR queries as fit NewsAPI's length limit"""
+        queries = []
+        terms = []
+        for symbol in symbols:
+            for keyword in self._get_keywords(symbol):
+                term = f'"{keyword}"' if ' ' in keyword else keyword
+                if terms and len(' OR '.join(terms + [term])) > self.max_query_length:
+                    queries.append(' OR '.join(terms))
+                    terms = []
+                terms.append(term)
+        if terms:
+            queries.append(' OR '.join(terms))
+        return queries
+
+    def _fetch_query(self, query, start_date, end_date=None):
+        """Articles matching a query published between start_date and end_date (None: now), newest first.
+
+        NewsAPI returns at most page_size articles per request (and on the
+        free plan won't page past the first 100), so when totalResults says
+        there are more, the query is repeated for the window before the
+        oldest article received, up to max_requests_per_query times. Also
+        returns the end of the window still missing, or None if nothing is.
+        """
+        articles = []
+        for _ in range(self.max_requests_per_query):
+            news = self.news_client.get_everything(
+                q=query,
+                from_param=start_date,
+                to=end_date,
+                language='en',
+                sort_by='publishedAt',
+                page_size=100
+            )
+            batch = news['articles']
+            articles.extend(batch)
+            if len(batch) >= news.get('totalResults', 0) or not batch:
+                return articles, None
+            oldest = min((article.get('publishedAt') or '') for article in batch)[:19]
+            if not oldest or oldest == end_date:
+                # A whole response published within one second, the window can't be narrowed further
+                return articles, None
+            # The boundary second is fetched again; its articles are deduplicated by URL
+            end_date = oldest
+        return articles, end_date
+
+    def _route(self, articles, symbols):
+        for article in articles:
+            text = f"{article.get('title') or ''} {article.get('description') or ''} {article.get('content') or ''}"
+            for symbol in symbols:
+                if self.patterns[symbol].search(text):
+                    self.articles[symbol][article.get('url') or article.get('title')] = article
+
+    def _fetch(self, symbols, start_date):
+        """Run the combined queries, route the returned articles to symbols and return the newest publishedAt.
+
+        A query with more new articles than one refresh may fetch leaves a
+        gap between start_date and the oldest article received. Gaps are
+        remembered and filled, oldest news last, by the following refreshes.
+        """
+        start = start_date.strftime('%Y-%m-%dT%H:%M:%S')
+        newest = None
+        gaps = []
+        for query in self._build_queries(symbols):
+            articles, gap_end = self._fetch_query(query, start)
+            if gap_end:
+                print(f"More news than one refresh fetches, backfilling before {gap_end} later")
+                gaps.append((query, start, gap_end))
+            for article in articles:
+                published_at = article.get('publishedAt') or ''
+                if newest is None or published_at > newest:
+                    newest = published_at
+            self._route(articles, symbols)
+        # Recorded once every query succeeded; after a failure the same window is fetched again anyway
+        self.gaps.extend(gaps)
+        return newest
+
+    def _fill_gaps(self):
+        """Fetch one more part of each window an earlier refresh had to cut short"""
+        cutoff = (datetime.utcnow() - timedelta(hours=self.lookback_hours)).strftime('%Y-%m-%dT%H:%M:%S')
+        gaps, self.gaps = self.gaps, []
+        for index, (query, start, end) in enumerate(gaps):
+            if end <= cutoff:
+                continue  # Everything still missing is older than the lookback
+            start = max(start, cutoff)
+            try:
+                articles, gap_end = self._fetch_query(query, start, end)
+            except Exception as e:
+                print(f"Error backfilling news: {str(e)}")
+                self.gaps.extend(gaps[index:])
+                return
+            if gap_end:
+                self.gaps.append((query, start, gap_end))
+            self._route(articles, self.symbols)
+
+    def _prune(self):
+        """Drop articles that fell out of the lookback window"""
+        cutoff = (datetime.utcnow() - timedelta(hours=self.lookback_hours)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        for articles in self.articles.values():
+            for key in [key for key, article in articles.items() if (article.get('publishedAt') or '') < cutoff]:
+                del articles[key]
+
+    def refresh(self, force=False):
+        """Fetch articles published since the last one seen, at most once per cache TTL"""
+        current_time = time.time()
+        if not force and current_time - self.last_fetch_time < self.cache_ttl:
+            return
+
+        if self.last_published_at:
+            start_date = datetime.strptime(self.last_published_at[:19], '%Y-%m-%dT%H:%M:%S')
+        else:
+            start_date = datetime.utcnow() - timedelta(hours=self.lookback_hours)
+
+        try:
+            self._fill_gaps()
+            newest = self._fetch(self.symbols, start_date)
+            # Only move the cursor once every query succeeded; anything cut short is in self.gaps
+            if newest and (self.last_published_at is None or newest > self.last_published_at):
+                self.last_published_at = newest
+            self.last_fetch_time = current_time
+        except Exception as e:
+            print(f"Error fetching news: {str(e)}")
+        self._prune()
+
+    def get_articles(self, symbol):
+        """Get cached articles for a symbol, oldest first"""
+        with self.lock:
+            if symbol not in self.articles:
+                # New symbol: backfill it on its own, later refreshes include it in the combined query
+                self._add_symbol(symbol)
+                try:
+                    self._fetch([symbol], datetime.utcnow() - timedelta(hours=self.lookback_hours))
+                except Exception as e:
+                    print(f"Error fetching news for {symbol}: {str(e)}")
+
+            # The first caller refreshes the shared cache; the others wait and reuse it
+            self.refresh()
+            return sorted(self.articles[symbol].values(), key=lambda article: article.get('publishedAt') or '')
@@ -0,0 +1,126 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+# Lower numbers are delivered first
+PRIORITY_BREAKING = 0
+PRIORITY_ALERT = 1
+PRIORITY_INSIGHT = 2
+
+
+class ChannelQueue:
+    """Pending messages and rate budget for one channel"""
+
+    def __init__(self, rate):
+        self.pending = []  # heap of (priority, sequence, content, embed, future)
+        self.ready = asyncio.Event()
+        self.tokens = rate
+        self.refilled_at = time.monotonic()
+        self.task = None
+
+
+class OutboundScheduler:
+    """Deliver channel messages by priority within a per-channel rate budget.
+
+    Messages of the same priority that pile up while a channel is out of
+    budget are merged into one message with several embeds.
+    """
+
+    def __init__(self, rate=5, per=5.0, max_embeds=10, max_embed_chars=6000):
+        self.rate = rate  # Messages allowed per channel ...
+        self.per = per  # ... in this many seconds (Discord's per-channel limit)
+        self.max_embeds = max_embeds  # Discord's limit on embeds per message
+        self.max_embed_chars = max_embed_chars  # Discord's limit on the text of all embeds in one message
+        self.channels = {}  # channel id -> ChannelQueue
+        self.sequence = itertools.count()
+
+    def submit(self, channel, content=None, embed=None, priority=PRIORITY_INSIGHT):
+        """Queue a message and return a future that resolves once it has been sent"""
+        queue = self.channels.get(channel.id)
+        if queue is None:
+            queue = self.channels[channel.id] = ChannelQueue(self.rate)
+            queue.task = asyncio.create_task(self._deliver(channel, queue))
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(queue.pending, (priority, next(self.sequence), content, embed, future))
+        queue.ready.set()
+        return future
+
+    async def _acquire(self, queue):
+        """Wait until the channel has budget for one more message"""
+        while True:
+            now = time.monotonic()
+            queue.tokens = min(self.rate, queue.tokens + (now - queue.refilled_at) * self.rate / self.per)
+            queue.refilled_at = now
+            if queue.tokens >= 1:
+                queue.tokens -= 1
+                return
+            await asyncio.sleep((1 - queue.tokens) * self.per / self.rate)
+
+    def _next_batch(self, queue):
+        """Pop the most urgent message plus any queued after it with the same priority that fit in one message"""
+        batch = [heapq.heappop(queue.pending)]
+        priority = batch[0][0]
+        if batch[0][3] is None:
+            return batch  # Plain text messages are sent on their own
+        chars = len(batch[0][3])
+        while queue.pending and queue.pending[0][0] == priority and len(batch) < self.max_embeds:
+            embed = queue.pending[0][3]
+            if embed is None or chars + len(embed) > self.max_embed_chars:
+                break
+            chars += len(embed)
+            batch.append(heapq.heappop(queue.pending))
+        return batch
+
+    async def _deliver(self, channel, queue):
+        while True:
+            await queue.ready.wait()
+            if not queue.pending:
+                queue.ready.clear()
+                continue
+
+            # Take the batch only once budget is available, so more can be merged in meanwhile
+            await self._acquire(queue)
+            batch = self._next_batch(queue)
+
+            if not await self._send(channel, batch, report_failure=len(batch) == 1):
+                # Don't let one message Discord rejects take the rest of a merged batch down with it
+                for message in batch:
+                    await self._acquire(queue)
+                    await self._send(channel, [message])
+
+    async def _send(self, channel, batch, report_failure=True):
+        """Send a batch as one message and resolve its futures; on failure leave them pending unless report_failure"""
+        contents = []
+        for _, _, content, _, _ in batch:
+            if content and content not in contents:
+                contents.append(content)
+        kwargs = {}
+        if contents:
+            kwargs['content'] = '\n'.join(contents)
+        embeds = [embed for _, _, _, embed, _ in batch if embed is not None]
+        if embeds:
+            kwargs['embeds'] = embeds
+
+        try:
+            await channel.send(**kwargs)
+        except Exception as e:
+            print(f"Error sending to channel {channel.id}: {e}")
+            if report_failure:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_result(False)
+            return False
+        for *_, future in batch:
+            if not future.done():
+                future.set_result(True)
+        return True
+
+    async def close(self):
+        """Stop all delivery tasks"""
+        for queue in self.channels.values():
+            if queue.task:
+                queue.task.cancel()
+        await asyncio.gather(*(queue.task for queue in self.channels.values() if queue.task), return_exceptions=True)
+        self.channels = {}
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from candle_scheduler import next_candle_close
+
+
+class SymbolTrigger:
+    """Trigger state of one watched symbol"""
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.reference_price = None  # Price at the last analysis, moves are measured from here
+        self.last_price = None
+        self.next_close = None
+        self.last_run = 0.0
+        self.task = None  # Analysis waiting to start or running
+        self.reasons = set()  # Why the waiting analysis was requested: 'price move' and/or 'candle close'
+        self.runs = 0
+        self.coalesced = 0  # Triggers folded into an analysis that was already waiting
+        self.cancelled = 0  # Moves that had reverted by the time their analysis was due
+
+
+class PriceMoveWatcher:
+    """Re-analyse a symbol when its price moves far enough, or when its candle closes.
+
+    All prices are fetched with one request per poll, so a quiet market
+    costs a single call every poll_interval seconds. A triggered analysis
+    starts after debounce seconds, and no sooner than min_interval seconds
+    after the symbol's previous one. Triggers arriving in the meantime are
+    folded into it, and a move that has reverted by then is dropped.
+    """
+
+    def __init__(self, symbols, get_prices, analyze, timeframe='1h', threshold=0.02, poll_interval=30,
+                 debounce=10, min_interval=300, close_delay=2, max_concurrent=2):
+        self.get_prices = get_prices  # symbols -> {symbol: price}, blocking
+        self.analyze = analyze  # symbol -> None, blocking
+        self.timeframe = timeframe
+        self.threshold = threshold  # Relative price move, 0.02 is 2%
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.min_interval = min_interval
+        self.close_delay = close_delay
+        self.running = asyncio.Semaphore(max_concurrent)  # Analyses running at once, e.g. after a candle close
+        self.triggers = {symbol: SymbolTrigger(symbol) for symbol in symbols}
+
+    async def run(self):
+        """Watch prices and trigger analyses until cancelled"""
+        now = time.time()
+        for trigger in self.triggers.values():
+            trigger.next_close = next_candle_close(now, self.timeframe)
+
+        while True:
+            try:
+                prices = await asyncio.to_thread(self.get_prices, list(self.triggers))
+            except Exception as e:
+                print(f"Error fetching prices to watch: {str(e)}")
+                prices = {}
+
+            now = time.time()
+            for symbol, trigger in self.triggers.items():
+                price = prices.get(symbol)
+                if price is not None:
+                    trigger.last_price = price
+                    if trigger.reference_price is None:
+                        trigger.reference_price = price
+                    if abs(self._move(trigger)) >= self.threshold:
+                        self._request(trigger, 'price move')
+                if now >= trigger.next_close + self.close_delay:
+                    trigger.next_close = next_candle_close(now, self.timeframe)
+                    self._request(trigger, 'candle close')
+
+            await asyncio.sleep(self.poll_interval)
+
+    @staticmethod
+    def _move(trigger):
+        """Relative price change since the last analysis"""
+        if not trigger.reference_price or trigger.last_price is None:
+            return 0.0
+        return trigger.last_price / trigger.reference_price - 1
+
+    def _request(self, trigger, reason):
+        if trigger.task is not None and not trigger.task.done():
+            trigger.coalesced += 1
+            trigger.reasons.add(reason)
+            return
+        trigger.reasons = {reason}
+        start_at = max(time.time() + self.debounce, trigger.last_run + self.min_interval)
+        trigger.task = asyncio.create_task(self._run(trigger, start_at))
+
+    async def _run(self, trigger, start_at):
+        while True:
+            await asyncio.sleep(max(start_at - time.time(), 0))
+            move = self._move(trigger)
+            if 'candle close' not in trigger.reasons and abs(move) < self.threshold:
+                trigger.cancelled += 1
+                trigger.reasons = set()
+                print(f"{trigger.symbol}: move reverted, no analysis needed")
+                return
+
+            async with self.running:
+                reasons = ' and '.join(sorted(trigger.reasons))
+                trigger.reasons = set()
+                print(f"{trigger.symbol}: analysing after {reasons} ({move * 100:+.1f}% since the last analysis)")
+                trigger.reference_price = trigger.last_price
+                trigger.last_run = time.time()
+                try:
+                    await asyncio.to_thread(self.analyze, trigger.symbol)
+                except Exception as e:
+                    print(f"Error in triggered analysis of {trigger.symbol}: {str(e)}")
+                trigger.runs += 1
+
+            if not trigger.reasons:
+                return
+            # Triggered again during the analysis: go once more, at the rate limit
+            start_at = trigger.last_run + self.min_interval
+
+    def stats(self):
+        """Trigger statistics per symbol"""
+        return {
+            symbol: {
+                'runs': trigger.runs,
+                'coalesced': trigger.coalesced,
+                'cancelled': trigger.cancelled,
+                'reference_price': trigger.reference_price,
+                'last_price': trigger.last_price
+            }
+            for symbol, trigger in self.triggers.items()
+        }
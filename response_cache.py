@@ -0,0 +1,45 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Finished command responses keyed by (command, symbol, state version).
+
+    Payloads are stored as plain dicts (e.g. Embed.to_dict()) so every hit
+    can be turned into a fresh object. Market state refreshes run on worker
+    threads, hence the lock.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (command, symbol, version) -> (payload, expires at or None)
+        self.lock = threading.Lock()
+
+    def get(self, command, symbol, version):
+        """Return the cached payload, or None if missing or expired"""
+        key = (command, symbol, version)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return payload
+
+    def put(self, command, symbol, version, payload, ttl=None):
+        """Store a payload, optionally expiring after ttl seconds"""
+        with self.lock:
+            self.entries[(command, symbol, version)] = (payload, time.time() + ttl if ttl else None)
+            self.entries.move_to_end((command, symbol, version))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, symbol):
+        """Drop every response rendered for a symbol"""
+        with self.lock:
+            for key in [key for key in self.entries if key[1] == symbol]:
+                del self.entries[key]
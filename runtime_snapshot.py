@@ -0,0 +1,37 @@
+import json
+import os
+import time
+
+
+class RuntimeSnapshot:
+    """Save runtime state to a local JSON file so a restarted process can start warm"""
+
+    def __init__(self, path, max_age_seconds):
+        self.path = path
+        self.max_age_seconds = max_age_seconds  # Older snapshots are ignored on load
+
+    def save(self, state):
+        """Write the state, replacing the previous snapshot atomically"""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'saved_at': time.time(), 'state': state}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Could not save runtime snapshot: {e}")
+
+    def load(self):
+        """Return (state, age in seconds), or (None, None) if there is no usable snapshot"""
+        if not os.path.exists(self.path):
+            return None, None
+        try:
+            with open(self.path, 'r') as f:
+                snapshot = json.load(f)
+            age = time.time() - snapshot['saved_at']
+            if age > self.max_age_seconds:
+                print(f"Ignoring runtime snapshot saved {age / 3600:.1f} hours ago")
+                return None, None
+            return snapshot['state'], age
+        except Exception as e:
+            print(f"Could not load runtime snapshot: {e}")
+            return None, None
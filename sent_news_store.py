@@ -0,0 +1,93 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class SentNewsStore:
+    """Remember which news items were already sent, bounded in time and size and kept on disk.
+
+    Items are keyed by a stable digest so the history survives restarts. Each
+    new item is appended to a log file as "<timestamp> <digest>"; the log is
+    rewritten without expired entries once it grows well past the live set.
+    """
+
+    def __init__(self, path, ttl_seconds=30 * 24 * 3600, max_entries=50000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # digest -> time sent, oldest first
+        self.log_lines = 0
+        self.lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def digest(text):
+        """Stable digest of a news item, independent of case and spacing"""
+        normalized = ' '.join(text.lower().split())
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=12).hexdigest()
+
+    def _load(self):
+        """Reload unexpired entries from the log"""
+        if not os.path.exists(self.path):
+            return
+        cutoff = time.time() - self.ttl_seconds
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    self.log_lines += 1
+                    parts = line.split()
+                    if len(parts) != 2:
+                        continue  # Partly written line from a crash
+                    try:
+                        sent_at = float(parts[0])
+                    except ValueError:
+                        continue
+                    if sent_at >= cutoff:
+                        self.entries[parts[1]] = sent_at
+                        self.entries.move_to_end(parts[1])
+            self._expire()
+        except Exception as e:
+            print(f"Could not load sent news history: {e}")
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl_seconds
+        while self.entries:
+            oldest, sent_at = next(iter(self.entries.items()))
+            if sent_at >= cutoff and len(self.entries) <= self.max_entries:
+                break
+            del self.entries[oldest]
+
+    def _compact(self):
+        """Rewrite the log with only the live entries"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            for digest, sent_at in self.entries.items():
+                f.write(f"{sent_at:.0f} {digest}\n")
+        os.replace(tmp_path, self.path)
+        self.log_lines = len(self.entries)
+
+    def __contains__(self, text):
+        with self.lock:
+            digest = self.digest(text)
+            sent_at = self.entries.get(digest)
+            return sent_at is not None and sent_at >= time.time() - self.ttl_seconds
+
+    def add(self, text):
+        """Record a news item as sent"""
+        with self.lock:
+            digest = self.digest(text)
+            sent_at = time.time()
+            self.entries[digest] = sent_at
+            self.entries.move_to_end(digest)
+            self._expire()
+            try:
+                if self.log_lines > 2 * max(len(self.entries), 1000):
+                    self._compact()
+                else:
+                    with open(self.path, 'a') as f:
+                        f.write(f"{sent_at:.0f} {digest}\n")
+                    self.log_lines += 1
+            except Exception as e:
+                print(f"Could not save sent news history: {e}")
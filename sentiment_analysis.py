@@ -2,10 +2,15 @@ from textblob import TextBlob
 import numpy as np
 from datetime import datetime, timedelta
 import config
+from news_dedup import NewsDeduplicator
 
 class SentimentAnalyzer:
     def __init__(self):
         self.sentiment_threshold = config.SENTIMENT_THRESHOLD
+        self.news_deduplicator = NewsDeduplicator(
+            max_fingerprints=config.NEWS_DEDUP_MAX_FINGERPRINTS,
+            max_distance=config.NEWS_DEDUP_MAX_DISTANCE
+        )
 
     def analyze_text(self, text):
         """Analyze sentiment of a single text"""
@@ -19,12 +24,11 @@ class SentimentAnalyzer:
         if not news_articles:
             return 0.5  # Neutral sentiment if no news
 
-        sentiments = []
-        for article in news_articles:
-            # Combine title and description for analysis
-            text = f"{article['title']} {article['description']}"
-            sentiment = self.analyze_text(text)
-            sentiments.append(sentiment)
+        # Combine title and description for analysis
+        texts = [f"{article['title']} {article['description']}" for article in news_articles]
+
+        # Syndicated copies of the same story are scored once so they don't skew the average
+        sentiments = self.news_deduplicator.score_clusters(texts, self.analyze_text)
 
         # Weight more recent articles more heavily
         weights = np.linspace(0.5, 1.0, len(sentiments))
@@ -39,7 +43,13 @@ class SentimentAnalyzer:
 
         sentiments = []
         for tweet in tweets:
-            sentiment = self.analyze_text(tweet)
+            if isinstance(tweet, dict):
+                # Tweets from the rolling window keep their score, so each is only scored once
+                if tweet.get('sentiment') is None:
+                    tweet['sentiment'] = self.analyze_text(tweet['text'])
+                sentiment = tweet['sentiment']
+            else:
+                sentiment = self.analyze_text(tweet)
             sentiments.append(sentiment)
 
         # Weight more recent tweets more heavily
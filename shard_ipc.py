@@ -0,0 +1,208 @@
+import queue
+import secrets
+import socket
+import threading
+import time
+from multiprocessing.connection import Connection, answer_challenge, deliver_challenge
+
+HANDSHAKE_TIMEOUT = 10  # Seconds either side waits on the other during authentication
+SEND_TIMEOUT = 30  # Seconds a shard may take to take in one message before the hub drops it
+SEND_QUEUE_SIZE = 100  # Messages waiting for a shard before the hub drops it
+
+
+class _HandshakeConnection:
+    """Connection whose reads give up at a deadline, for the authentication handshake only"""
+
+    def __init__(self, conn, timeout):
+        self.conn = conn
+        self.deadline = time.monotonic() + timeout
+
+    def send_bytes(self, data):
+        self.conn.send_bytes(data)
+
+    def recv_bytes(self, maxlength=None):
+        if not self.conn.poll(max(self.deadline - time.monotonic(), 0)):
+            raise TimeoutError("Shard handshake timed out")
+        return self.conn.recv_bytes(maxlength)
+
+
+def _authenticate(sock, authkey, serving, timeout=HANDSHAKE_TIMEOUT):
+    """Run the multiprocessing.connection authentication on a connected socket and return the Connection.
+
+    Same as Listener.accept()/Client(), except that a peer which stops
+    answering fails the handshake after timeout seconds instead of
+    blocking forever.
+    """
+    sock.settimeout(None)  # Connection expects a blocking socket
+    conn = Connection(sock.detach())
+    handshake = _HandshakeConnection(conn, timeout)
+    try:
+        if serving:
+            deliver_challenge(handshake, authkey)
+            answer_challenge(handshake, authkey)
+        else:
+            answer_challenge(handshake, authkey)
+            deliver_challenge(handshake, authkey)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+class _ShardLink:
+    """The hub's connection to one shard, sent to from its own thread.
+
+    publish() only queues messages, so a shard that stops reading stalls
+    its own thread rather than the hub, and is dropped once a message has
+    been stuck for SEND_TIMEOUT seconds or its queue is full.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.queue = queue.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.sending_since = None  # When the message being sent was picked up, None while idle
+        self.closed = False
+        self.lock = threading.Lock()  # Guards closing the connection
+        threading.Thread(target=self._send_loop, name='shard-hub-send', daemon=True).start()
+
+    def _send_loop(self):
+        while not self.closed:
+            message = self.queue.get()
+            if message is None:
+                break
+            self.sending_since = time.monotonic()
+            try:
+                self.conn.send(message)
+            except Exception:
+                # The shard went away; it gets the replayed state when it reconnects
+                break
+            self.sending_since = None
+        with self.lock:
+            self.closed = True
+            self.conn.close()
+
+    def send(self, message):
+        """Queue a message for the shard; False if the shard is gone or too far behind"""
+        if self.closed:
+            return False
+        if self.sending_since is not None and time.monotonic() - self.sending_since > SEND_TIMEOUT:
+            return False
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            return False
+        return True
+
+    def close(self):
+        """Stop sending, waking a send stuck on a shard that stopped reading"""
+        with self.lock:
+            if not self.conn.closed:
+                try:
+                    # Shutting the socket down makes a blocked send fail; the send thread then closes it
+                    sock = socket.socket(fileno=self.conn.fileno())
+                    try:
+                        sock.shutdown(socket.SHUT_RDWR)
+                    finally:
+                        sock.detach()
+                except OSError:
+                    pass
+            self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass  # The send thread is busy, and fails on the shut down socket
+
+
+class SnapshotHub:
+    """Broadcast shared data to shard processes over an authenticated local socket"""
+
+    def __init__(self, address=('127.0.0.1', 0), authkey=None):
+        self.authkey = authkey or secrets.token_bytes(16)
+        self.server = socket.create_server(address)
+        self.address = self.server.getsockname()
+        self.links = []
+        self.latest = {}  # message type -> last message, replayed to shards that connect later
+        self.lock = threading.Lock()
+        self.closed = False
+        threading.Thread(target=self._accept_loop, name='shard-hub-accept', daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                sock, _ = self.server.accept()
+            except OSError as e:
+                if self.closed:
+                    return
+                print(f"Error accepting shard connection: {e}")
+                time.sleep(1)
+                continue
+            # Each handshake on its own thread, so a client that never answers holds up nobody else
+            threading.Thread(target=self._add_connection, args=(sock,), name='shard-hub-handshake', daemon=True).start()
+
+    def _add_connection(self, sock):
+        try:
+            conn = _authenticate(sock, self.authkey, serving=True)
+        except Exception as e:
+            print(f"Rejected shard connection: {e!r}")
+            sock.close()
+            return
+        link = _ShardLink(conn)
+        with self.lock:
+            if self.closed:
+                link.close()
+                return
+            for message in self.latest.values():
+                link.send(message)
+            self.links.append(link)
+
+    def publish(self, message, replay=False):
+        """Queue a message dict (with a 'type' key) for every connected shard, without waiting on any of them"""
+        with self.lock:
+            if replay:
+                self.latest[message['type']] = message
+            for link in list(self.links):
+                if not link.send(message):
+                    if not link.closed:
+                        print("Dropping a shard that stopped taking messages")
+                    self.links.remove(link)
+                    link.close()
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            for link in self.links:
+                link.close()
+            self.links = []
+        try:
+            # Wakes the accept thread, which close() alone doesn't on Linux
+            self.server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.server.close()
+
+
+class SnapshotSubscriber:
+    """Receive hub messages on a background thread and pass each one to a callback"""
+
+    def __init__(self, address, authkey, callback, retry_seconds=5):
+        self.address = address
+        self.authkey = authkey
+        self.callback = callback
+        self.retry_seconds = retry_seconds
+        self.thread = threading.Thread(target=self._receive_loop, name='shard-hub-receive', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _receive_loop(self):
+        while True:
+            try:
+                sock = socket.create_connection(self.address, timeout=HANDSHAKE_TIMEOUT)
+                conn = _authenticate(sock, self.authkey, serving=False)
+                while True:
+                    self.callback(conn.recv())
+            except (EOFError, OSError) as e:
+                print(f"Lost connection to shard hub, retrying: {e}")
+            except Exception as e:
+                print(f"Error receiving from shard hub: {e}")
+            time.sleep(self.retry_seconds)
@@ -0,0 +1,214 @@
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from signal_journal import CONFIDENCE_BUCKETS
+
+DEFAULT_DATABASE_FILE = 'trading_signals.db'
+
+SIGNAL_COLUMNS = [
+    'id', 'symbol', 'timestamp', 'recommendation', 'confidence', 'current_price',
+    'technical_confidence', 'technical_signal', 'rsi', 'macd', 'macd_signal', 'bb_position',
+    'sentiment_confidence', 'news_sentiment', 'tweet_sentiment'
+]
+
+
+class SignalHistory:
+    """Read-only queries over the signals journal written by SignalJournal.
+
+    Listings are served by the signals table indexes, the confidence
+    distribution by the counts the journal keeps on insert. Listings are
+    paginated with a (timestamp, id) cursor instead of OFFSET, so later pages
+    cost the same as the first however many rows there are.
+    """
+
+    def __init__(self, path=DEFAULT_DATABASE_FILE):
+        self.path = path
+
+    def _connect(self):
+        # A short-lived read-only connection per query, so callers can use this from any thread
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+
+    def _query(self, sql, params=()):
+        if not os.path.exists(self.path):
+            return []
+        connection = self._connect()
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+
+    def latest_per_symbol(self, symbols=None):
+        """Most recent signal of each symbol, as dicts"""
+        if symbols is None:
+            symbols = [row[0] for row in self._query("SELECT DISTINCT symbol FROM signals ORDER BY symbol")]
+        results = []
+        for symbol in symbols:
+            rows = self._query(
+                f"SELECT {', '.join(SIGNAL_COLUMNS)} FROM signals WHERE symbol = ? ORDER BY timestamp DESC, id DESC LIMIT 1",
+                (symbol,)
+            )
+            results.extend(dict(zip(SIGNAL_COLUMNS, row)) for row in rows)
+        return results
+
+    def signals(self, symbol=None, recommendation=None, start=None, end=None, limit=50, cursor=None, newest_first=False):
+        """One page of signals matching the filters, and the cursor for the next page (None on the last).
+
+        start and end are Unix timestamps; cursor is the value returned with
+        the previous page.
+        """
+        conditions, params = [], []
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        if recommendation is not None:
+            conditions.append("recommendation = ?")
+            params.append(recommendation)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("timestamp < ?")
+            params.append(end)
+        if cursor is not None:
+            cursor_timestamp, cursor_id = cursor
+            comparison = '<' if newest_first else '>'
+            conditions.append(f"(timestamp {comparison} ? OR (timestamp = ? AND id {comparison} ?))")
+            params.extend([cursor_timestamp, cursor_timestamp, cursor_id])
+
+        order = 'DESC' if newest_first else 'ASC'
+        sql = f"SELECT {', '.join(SIGNAL_COLUMNS)} FROM signals"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY timestamp {order}, id {order} LIMIT ?"
+        # One extra row tells whether there is another page
+        rows = self._query(sql, params + [limit + 1])
+
+        page = [dict(zip(SIGNAL_COLUMNS, row)) for row in rows[:limit]]
+        next_cursor = (page[-1]['timestamp'], page[-1]['id']) if len(rows) > limit else None
+        return page, next_cursor
+
+    def buy_signals(self, start=None, end=None, limit=50, cursor=None):
+        """One page of BUY signals in a time range, oldest first"""
+        return self.signals(recommendation='BUY', start=start, end=end, limit=limit, cursor=cursor)
+
+    def confidence_distribution(self, symbol=None, buckets=10):
+        """Count of signals per confidence bucket, as {symbol: [count per bucket]}.
+
+        Read from the counts the journal keeps on insert, so this costs the
+        same for a thousand signals as for millions. buckets must divide
+        CONFIDENCE_BUCKETS.
+        """
+        if buckets <= 0 or CONFIDENCE_BUCKETS % buckets:
+            raise ValueError(f"buckets must divide {CONFIDENCE_BUCKETS}")
+        sql = "SELECT symbol, bucket, count FROM signal_confidence_counts"
+        params = []
+        if symbol is not None:
+            sql += " WHERE symbol = ?"
+            params.append(symbol)
+
+        distribution = {}
+        for row_symbol, bucket, count in self._query(sql, params):
+            counts = distribution.setdefault(row_symbol, [0] * buckets)
+            counts[bucket * buckets // CONFIDENCE_BUCKETS] += count
+        return distribution
+
+
+def export_rows(rows, path):
+    """Write query results to a .csv or .parquet file (Parquet needs pandas with pyarrow)"""
+    if path.endswith('.parquet'):
+        import pandas as pd
+        pd.DataFrame(rows, columns=SIGNAL_COLUMNS).to_parquet(path, index=False)
+    elif path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=SIGNAL_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        raise ValueError(f"Unsupported export format: {path} (use .csv or .parquet)")
+
+
+def _parse_time(text):
+    """Parse a local date/time like '2024-05-01' or '2024-05-01 14:00' into a Unix timestamp"""
+    return datetime.fromisoformat(text).timestamp()
+
+
+def _format_signal(signal):
+    when = datetime.fromtimestamp(signal['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+    price = f"${signal['current_price']:.2f}" if signal['current_price'] is not None else '-'
+    return f"{when}  {signal['symbol']:<10} {signal['recommendation']:<5} {signal['confidence'] * 100:5.1f}%  {price}"
+
+
+def main(argv=None):
+    """Command line access to the signal history"""
+    parser = argparse.ArgumentParser(prog='history', description="Query stored trading signals")
+    parser.add_argument('--database', default=None, help="Signals database (default: config.DATABASE_FILE)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    latest = commands.add_parser('latest', help="Latest signal per symbol")
+    latest.add_argument('--symbol', action='append', help="Only this symbol (repeatable)")
+
+    for name, help_text in (('list', "Signals matching the filters"), ('buys', "BUY signals in a time range")):
+        listing = commands.add_parser(name, help=help_text)
+        listing.add_argument('--symbol')
+        if name == 'list':
+            listing.add_argument('--recommendation', choices=['BUY', 'HOLD'])
+        listing.add_argument('--since', help="Start time, e.g. 2024-05-01 or '2024-05-01 14:00'")
+        listing.add_argument('--until', help="End time (exclusive)")
+        listing.add_argument('--limit', type=int, default=50, help="Rows per page")
+        listing.add_argument('--cursor', help="Cursor printed after the previous page")
+        listing.add_argument('--export', help="Also write the page to this .csv or .parquet file")
+
+    distribution = commands.add_parser('distribution', help="Confidence distribution per symbol")
+    distribution.add_argument('--symbol')
+    distribution.add_argument('--buckets', type=int, default=10)
+
+    args = parser.parse_args(argv)
+    database = args.database
+    if database is None:
+        try:
+            import config
+            database = config.DATABASE_FILE
+        except Exception:
+            database = DEFAULT_DATABASE_FILE
+    history = SignalHistory(database)
+
+    started = time.perf_counter()
+    if args.command == 'latest':
+        for signal in history.latest_per_symbol(args.symbol):
+            print(_format_signal(signal))
+    elif args.command == 'distribution':
+        for symbol, counts in sorted(history.confidence_distribution(args.symbol, args.buckets).items()):
+            width = 100 // args.buckets
+            print(f"{symbol}:")
+            for bucket, count in enumerate(counts):
+                print(f"  {bucket * width:3d}-{(bucket + 1) * width:3d}%  {count}")
+    else:
+        cursor = None
+        if args.cursor:
+            cursor_timestamp, cursor_id = args.cursor.split(':')
+            cursor = (float(cursor_timestamp), int(cursor_id))
+        page, next_cursor = history.signals(
+            symbol=args.symbol,
+            recommendation='BUY' if args.command == 'buys' else args.recommendation,
+            start=_parse_time(args.since) if args.since else None,
+            end=_parse_time(args.until) if args.until else None,
+            limit=args.limit,
+            cursor=cursor
+        )
+        for signal in page:
+            print(_format_signal(signal))
+        if next_cursor:
+            print(f"More results: --cursor {next_cursor[0]!r}:{next_cursor[1]}")
+        if args.export:
+            export_rows(page, args.export)
+            print(f"Exported {len(page)} signals to {args.export}")
+    print(f"({(time.perf_counter() - started) * 1000:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
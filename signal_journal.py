@@ -0,0 +1,240 @@
+import queue
+import sqlite3
+import threading
+import time
+
+CREATE_SIGNALS_TABLE = """
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    recommendation TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    current_price REAL,
+    technical_confidence REAL,
+    technical_signal REAL,
+    rsi REAL,
+    macd REAL,
+    macd_signal REAL,
+    bb_position REAL,
+    sentiment_confidence REAL,
+    news_sentiment REAL,
+    tweet_sentiment REAL
+)
+"""
+
+CREATE_SIGNALS_INDEXES = [
+    # Per-symbol history and latest signal per symbol
+    "CREATE INDEX IF NOT EXISTS idx_signals_symbol_timestamp ON signals (symbol, timestamp)",
+    # BUY (or HOLD) signals in a time range
+    "CREATE INDEX IF NOT EXISTS idx_signals_recommendation_timestamp ON signals (recommendation, timestamp)"
+]
+
+# Confidence distribution is kept up to date on insert, so reading it doesn't depend on the table size
+CONFIDENCE_BUCKETS = 20  # 5% wide
+
+CONFIDENCE_BUCKET_SQL = f"MIN(MAX(CAST(confidence * {CONFIDENCE_BUCKETS} AS INTEGER), 0), {CONFIDENCE_BUCKETS - 1})"
+
+CREATE_CONFIDENCE_COUNTS_TABLE = """
+CREATE TABLE IF NOT EXISTS signal_confidence_counts (
+    symbol TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (symbol, bucket)
+) WITHOUT ROWID
+"""
+
+CREATE_CONFIDENCE_COUNTS_TRIGGER = f"""
+CREATE TRIGGER IF NOT EXISTS signals_count_confidence AFTER INSERT ON signals
+BEGIN
+    INSERT INTO signal_confidence_counts (symbol, bucket, count)
+    VALUES (NEW.symbol, {CONFIDENCE_BUCKET_SQL.replace('confidence', 'NEW.confidence')}, 1)
+    ON CONFLICT (symbol, bucket) DO UPDATE SET count = count + 1;
+END
+"""
+
+BACKFILL_CONFIDENCE_COUNTS = f"""
+INSERT INTO signal_confidence_counts (symbol, bucket, count)
+SELECT symbol, {CONFIDENCE_BUCKET_SQL} AS bucket, COUNT(*) FROM signals GROUP BY symbol, bucket
+"""
+
+# One constant statement, so sqlite3 prepares it once and reuses it for every row
+INSERT_SIGNAL = """
+INSERT INTO signals (
+    symbol, timestamp, recommendation, confidence, current_price,
+    technical_confidence, technical_signal, rsi, macd, macd_signal, bb_position,
+    sentiment_confidence, news_sentiment, tweet_sentiment
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Queue markers for the writer thread
+_FLUSH = object()
+_CLOSE = object()
+
+
+def _number(value):
+    """Plain float (numpy scalars included) or None"""
+    return None if value is None else float(value)
+
+
+def signal_row(symbol, signal):
+    """Flatten a SignalGenerator signal into a signals table row"""
+    technical = signal['analysis']['technical']
+    sentiment = signal['analysis']['sentiment']
+    indicators = technical.get('indicators', {})
+    components = sentiment.get('components', {})
+    return (
+        symbol,
+        signal['timestamp'].timestamp(),
+        signal['recommendation'],
+        _number(signal['confidence']),
+        _number(signal['current_price']),
+        _number(technical.get('confidence')),
+        _number(technical.get('signal')),
+        _number(indicators.get('rsi')),
+        _number(indicators.get('macd')),
+        _number(indicators.get('macd_signal')),
+        _number(indicators.get('bb_position')),
+        _number(sentiment.get('confidence')),
+        _number(components.get('news_sentiment')),
+        _number(components.get('tweet_sentiment'))
+    )
+
+
+class SignalJournal:
+    """Write every generated signal to SQLite from a background thread.
+
+    record() only queues the row, so the analysis loop never waits on disk.
+    Rows are written in one transaction per flush(), normally once a cycle,
+    or sooner if max_batch rows pile up. A row the database rejects is
+    skipped on its own. While the database can't be written at all, rows
+    are held and retried, up to max_pending of them.
+    """
+
+    def __init__(self, path, max_batch=500, max_pending=10000, retry_delay=30):
+        self.path = path
+        self.max_batch = max_batch
+        self.max_pending = max_pending  # Rows held, queued or unwritten, before new ones are dropped
+        self.retry_delay = retry_delay  # Seconds between attempts while the database can't be written
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.connection = None  # Only used by the writer thread
+        self.error = None  # Why the database can't be written, None while it can
+        self.retry_at = 0
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._write_loop, name='signal-journal', daemon=True)
+        self.thread.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        # WAL lets readers (history queries, the GUI) run while a batch is being written
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(CREATE_SIGNALS_TABLE)
+        for statement in CREATE_SIGNALS_INDEXES:
+            connection.execute(statement)
+        has_trigger = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'signals_count_confidence'"
+        ).fetchone()
+        if not has_trigger:
+            # Journals written before the counts existed are counted once, in the same transaction
+            connection.execute(CREATE_CONFIDENCE_COUNTS_TABLE)
+            connection.execute("DELETE FROM signal_confidence_counts")
+            connection.execute(BACKFILL_CONFIDENCE_COUNTS)
+            connection.execute(CREATE_CONFIDENCE_COUNTS_TRIGGER)
+        connection.commit()
+        return connection
+
+    def record(self, symbol, signal):
+        """Queue a signal to be written"""
+        try:
+            self.queue.put_nowait(signal_row(symbol, signal))
+        except queue.Full:
+            self.dropped += 1
+            print(f"Signal journal is {self.max_pending} signals behind ({self.error}), dropped the signal for {symbol}")
+        except Exception as e:
+            print(f"Could not record signal for {symbol}: {str(e)}")
+
+    def flush(self):
+        """Write everything recorded so far in one transaction"""
+        try:
+            self.queue.put_nowait(_FLUSH)
+        except queue.Full:
+            pass  # The writer has a full batch to write before it would get here anyway
+
+    def close(self):
+        """Write any remaining signals and stop the writer thread"""
+        self.queue.put(_CLOSE)
+        self.thread.join()
+
+    def _unavailable(self, error, rows):
+        """Keep rows for a later attempt after the database couldn't be opened or written"""
+        self.error = str(error)
+        self.retry_at = time.monotonic() + self.retry_delay
+        print(f"Could not write to signal journal {self.path}, keeping {len(rows)} signals to retry: {self.error}")
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        # What is still queued counts towards the limit as well
+        excess = len(rows) + self.queue.qsize() - self.max_pending
+        if excess > 0:
+            self.dropped += excess
+            print(f"Dropped the {excess} oldest signals the journal could not write")
+            rows = rows[excess:]
+        return rows
+
+    def _write(self, rows):
+        """Write rows and return those to retry later"""
+        if not rows:
+            return rows
+        try:
+            if self.connection is None:
+                self.connection = self._connect()
+            with self.connection:
+                self.connection.executemany(INSERT_SIGNAL, rows)
+            self.error = None
+            return []
+        except sqlite3.OperationalError as e:
+            # Locked, full or unreadable: the database's fault, not the rows'
+            return self._unavailable(e, rows)
+        except Exception as e:
+            if self.connection is None:
+                return self._unavailable(e, rows)
+            print(f"Could not write {len(rows)} signals to the journal in one go, writing them one by one: {str(e)}")
+
+        # One bad row rolls the whole batch back, so the others are written on their own
+        for position, row in enumerate(rows):
+            try:
+                with self.connection:
+                    self.connection.execute(INSERT_SIGNAL, row)
+            except sqlite3.OperationalError as e:
+                return self._unavailable(e, rows[position:])
+            except Exception as e:
+                print(f"Skipped a {row[0]} signal the journal rejected: {str(e)} {row!r}")
+        self.error = None
+        return []
+
+    def _write_loop(self):
+        try:
+            self.connection = self._connect()
+        except Exception as e:
+            self._unavailable(e, [])
+        rows = []
+        while True:
+            item = self.queue.get()
+            if item is _CLOSE:
+                rows = self._write(rows)
+                if rows:
+                    print(f"Closing the signal journal with {len(rows)} signals unwritten")
+                if self.connection is not None:
+                    self.connection.close()
+                return
+            if item is _FLUSH:
+                rows = self._write(rows)
+                continue
+            rows.append(item)
+            if len(rows) > self.max_pending:
+                dropped = rows.pop(0)
+                self.dropped += 1
+                print(f"Signal journal is {self.max_pending} signals behind ({self.error}), dropped a {dropped[0]} signal")
+            if len(rows) >= self.max_batch and time.monotonic() >= self.retry_at:
+                rows = self._write(rows)
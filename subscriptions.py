@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+
+# Kinds of scheduled posts a channel can subscribe to
+ALERT_TYPES = ['insights', 'technical', 'news_alerts', 'breaking_news']
+
+
+class SubscriptionStore:
+    """Which channels receive which scheduled posts, for which coins, saved to a local JSON file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.subscriptions = {}  # channel id -> {'guild_id', 'coins', 'alert_types'}
+        self.loaded_mtime = None
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            self.loaded_mtime = os.path.getmtime(self.path)
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.subscriptions = {int(channel_id): sub for channel_id, sub in data.items()}
+        except Exception as e:
+            print(f"Could not load subscriptions: {e}")
+
+    def reload_if_changed(self):
+        """Pick up changes written by another process sharing the file"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self.loaded_mtime:
+            with self.lock:
+                self._load()
+
+    def _save(self):
+        """Write all subscriptions, replacing the old file atomically"""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({str(channel_id): sub for channel_id, sub in self.subscriptions.items()}, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self.loaded_mtime = os.path.getmtime(self.path)
+        except Exception as e:
+            print(f"Could not save subscriptions: {e}")
+
+    def subscribe(self, guild_id, channel_id, coins, alert_types):
+        """Subscribe a channel, replacing any previous subscription it had"""
+        self.reload_if_changed()
+        with self.lock:
+            self.subscriptions[channel_id] = {
+                'guild_id': guild_id,
+                'coins': list(coins),
+                'alert_types': list(alert_types)
+            }
+            self._save()
+
+    def unsubscribe(self, channel_id):
+        """Remove a channel's subscription, returning whether it had one"""
+        self.reload_if_changed()
+        with self.lock:
+            removed = self.subscriptions.pop(channel_id, None) is not None
+            if removed:
+                self._save()
+            return removed
+
+    def channels_for(self, alert_type, coins=None):
+        """Get {channel id: subscribed coins} for channels taking this alert type.
+
+        With coins given, only channels following at least one of them are returned.
+        """
+        result = {}
+        for channel_id, sub in self.subscriptions.items():
+            if alert_type not in sub['alert_types']:
+                continue
+            if coins is not None and not set(coins) & set(sub['coins']):
+                continue
+            result[channel_id] = sub['coins']
+        return result
@@ -0,0 +1,127 @@
+import multiprocessing
+import signal
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from technical_analysis import TechnicalAnalyzer
+from sentiment_analysis import SentimentAnalyzer
+from signal_generator import SignalGenerator
+
+# Analyzers of the worker process, created once by _start_worker
+_analyzers = None
+
+
+def share_frame(df):
+    """Copy a klines frame into a new shared memory block.
+
+    Returns the block, which the caller unlinks once the workers are done
+    with it, and a small picklable description a worker maps it back with.
+    Each column is stored contiguously so it maps straight onto a Series.
+    """
+    columns = list(df.columns)
+    rows = len(df)
+    index_bytes = rows * 8
+    block = shared_memory.SharedMemory(create=True, size=max(index_bytes * (len(columns) + 1), 1))
+    index = np.ndarray((rows,), dtype=np.int64, buffer=block.buf)
+    index[:] = df.index.values.astype('datetime64[ns]').view(np.int64)
+    values = np.ndarray((len(columns), rows), dtype=np.float64, buffer=block.buf, offset=index_bytes)
+    for position, column in enumerate(columns):
+        values[position] = df[column].to_numpy(dtype=np.float64)
+    return block, {'name': block.name, 'rows': rows, 'columns': columns, 'index_name': df.index.name}
+
+
+def attach_frame(frame):
+    """Map a frame written by share_frame without copying it; close the returned block after dropping the frame"""
+    block = shared_memory.SharedMemory(name=frame['name'])
+    rows = frame['rows']
+    index = np.ndarray((rows,), dtype=np.int64, buffer=block.buf).view('datetime64[ns]')
+    values = np.ndarray((len(frame['columns']), rows), dtype=np.float64, buffer=block.buf, offset=rows * 8)
+    df = pd.DataFrame(
+        {column: values[position] for position, column in enumerate(frame['columns'])},
+        index=pd.DatetimeIndex(index, name=frame['index_name'], copy=False),
+        copy=False
+    )
+    return block, df
+
+
+def _start_worker():
+    global _analyzers
+    # Ctrl+C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _analyzers = (TechnicalAnalyzer(), SentimentAnalyzer(), SignalGenerator())
+
+
+def _analyze_in_worker(symbol, frame, news, tweets, current_price):
+    technical_analyzer, sentiment_analyzer, signal_generator = _analyzers
+    block, df = attach_frame(frame)
+    try:
+        technical_recommendation = technical_analyzer.get_buy_recommendation(df)
+    finally:
+        # The frame has to go before the mapping can be closed
+        del df
+        block.close()
+
+    sentiment_recommendation = sentiment_analyzer.get_sentiment_recommendation(news, tweets)
+    trading_signal = signal_generator.generate_signal(
+        technical_recommendation,
+        sentiment_recommendation,
+        current_price
+    )
+    # Tweet scores go back so the parent's rolling window keeps them
+    tweet_sentiments = [tweet.get('sentiment') if isinstance(tweet, dict) else None for tweet in tweets]
+    return symbol, trading_signal, tweet_sentiments
+
+
+class SymbolWorkerPool:
+    """Analyse symbols in worker processes, each owning a fixed share of the symbols.
+
+    A symbol always goes to the same process, so the analyzers there, and
+    the news dedup fingerprints they keep, carry over between cycles. Klines
+    reach the workers through shared memory instead of being pickled.
+    """
+
+    def __init__(self, symbols, processes):
+        self.processes = processes
+        # Spawned rather than forked: the parent already runs the journal and pipeline threads
+        self.context = multiprocessing.get_context('spawn')
+        self.executors = [self._start_executor() for _ in range(processes)]
+        self.shards = {symbol: position % processes for position, symbol in enumerate(symbols)}
+
+    def _start_executor(self):
+        return ProcessPoolExecutor(max_workers=1, mp_context=self.context, initializer=_start_worker)
+
+    def shard_of(self, symbol):
+        """Index of the process that analyses symbol"""
+        if symbol in self.shards:
+            return self.shards[symbol]
+        return zlib.crc32(symbol.encode()) % self.processes
+
+    def analyze(self, data):
+        """Same as CryptoTradingSignals.analyze_symbol_data, run in the symbol's worker process"""
+        shard = self.shard_of(data['symbol'])
+        block, frame = share_frame(data['df'])
+        try:
+            future = self.executors[shard].submit(
+                _analyze_in_worker, data['symbol'], frame, data['news'], data['tweets'], data['current_price']
+            )
+            symbol, trading_signal, tweet_sentiments = future.result()
+        except BrokenProcessPool:
+            print(f"Analysis worker {shard} died, restarting it")
+            self.executors[shard] = self._start_executor()
+            raise
+        finally:
+            block.close()
+            block.unlink()
+
+        for tweet, sentiment in zip(data['tweets'], tweet_sentiments):
+            if isinstance(tweet, dict) and sentiment is not None:
+                tweet['sentiment'] = sentiment
+        return symbol, trading_signal
+
+    def close(self):
+        """Stop the worker processes"""
+        for executor in self.executors:
+            executor.shutdown(cancel_futures=True)
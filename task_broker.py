@@ -0,0 +1,211 @@
+import sqlite3
+import time
+from urllib.parse import urlparse
+
+CREATE_TASKS_TABLE = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    cycle TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    not_before REAL NOT NULL DEFAULT 0,
+    payload TEXT,
+    result TEXT,
+    error TEXT,
+    finish_seq INTEGER,
+    created REAL NOT NULL,
+    UNIQUE (cycle, symbol)
+)
+"""
+
+CREATE_TASKS_INDEXES = [
+    # Claiming: the oldest task that is free to run
+    "CREATE INDEX IF NOT EXISTS idx_tasks_status_id ON tasks (status, id)",
+    # Collecting a cycle's results in the order they finished
+    "CREATE INDEX IF NOT EXISTS idx_tasks_cycle_finish_seq ON tasks (cycle, finish_seq)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_finish_seq ON tasks (finish_seq)"
+]
+
+# Numbers finished tasks in the order they finished. Writes are serialised, so it only ever goes up
+NEXT_FINISH_SEQ = "(SELECT COALESCE(MAX(finish_seq), 0) + 1 FROM tasks)"
+
+
+class SQLiteTaskBroker:
+    """Task queue for distributed analysis, kept in a SQLite database.
+
+    A local stand-in: WAL mode needs every process on the same host, and
+    SQLite locking isn't reliable on network filesystems, so the
+    coordinator and all workers have to run on one machine.
+
+    A task carries the data its symbol is analysed on, fetched once by the
+    coordinator, so workers make no API calls of their own. The payload is
+    dropped once the task is finished.
+
+    A claimed task is leased to its worker for lease_seconds. A worker that
+    dies simply lets the lease run out, and the next claim hands the task to
+    another worker. Tasks that fail or lose their lease are retried until
+    they have been attempted max_attempts times.
+    """
+
+    def __init__(self, path, lease_seconds=120, max_attempts=3, retry_delay=5):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay  # Seconds before a failed task is retried, times the attempts so far
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(CREATE_TASKS_TABLE)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(tasks)")}
+            if 'payload' not in columns:
+                # Created before tasks carried their data
+                connection.execute("ALTER TABLE tasks ADD COLUMN payload TEXT")
+            for statement in CREATE_TASKS_INDEXES:
+                connection.execute(statement)
+        finally:
+            connection.close()
+
+    def _connect(self):
+        # A connection per call, so coordinator and worker threads can share the broker.
+        # Transactions are opened explicitly, claims with BEGIN IMMEDIATE so two workers never take the same task
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def publish(self, cycle, symbols, timeframe, payloads=None):
+        """Add one task per symbol for an analysis cycle (tasks already published for it are kept).
+
+        payloads maps symbols to the text handed to the worker with the task.
+        """
+        now = time.time()
+        payloads = payloads or {}
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "INSERT OR IGNORE INTO tasks (cycle, symbol, timeframe, payload, created) VALUES (?, ?, ?, ?, ?)",
+                [(cycle, symbol, timeframe, payloads.get(symbol), now) for symbol in symbols]
+            )
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def claim(self, worker, limit=1):
+        """Lease up to limit runnable tasks to worker, as (id, cycle, symbol, timeframe, attempt, payload) tuples"""
+        now = time.time()
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            # Lost leases that were the last attempt are given up on
+            connection.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease expired on ' || worker, payload = NULL, "
+                f"finish_seq = {NEXT_FINISH_SEQ} "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            rows = connection.execute(
+                "SELECT id, cycle, symbol, timeframe, attempts, status, worker, payload FROM tasks "
+                "WHERE (status = 'pending' AND not_before <= ?) OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT ?",
+                (now, now, limit)
+            ).fetchall()
+            connection.executemany(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                [(worker, now + self.lease_seconds, row[0]) for row in rows]
+            )
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+        tasks = []
+        for task_id, cycle, symbol, timeframe, attempts, status, previous_worker, payload in rows:
+            if status == 'leased':
+                print(f"Reassigning {symbol} ({cycle}) from {previous_worker}, whose lease ran out")
+            tasks.append((task_id, cycle, symbol, timeframe, attempts + 1, payload))
+        return tasks
+
+    def complete(self, task_id, worker, result):
+        """Store a task's result; False if the lease was lost and the task now belongs to another worker"""
+        connection = self._connect()
+        try:
+            updated = connection.execute(
+                "UPDATE tasks SET status = 'done', result = ?, lease_expires = NULL, payload = NULL, "
+                f"finish_seq = {NEXT_FINISH_SEQ} "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (result, task_id, worker)
+            ).rowcount
+        finally:
+            connection.close()
+        return updated == 1
+
+    def fail(self, task_id, worker, error):
+        """Give a task back to be retried later, or mark it failed once it is out of attempts"""
+        now = time.time()
+        connection = self._connect()
+        try:
+            connection.execute(
+                "UPDATE tasks SET "
+                "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                f"finish_seq = CASE WHEN attempts >= ? THEN {NEXT_FINISH_SEQ} END, "
+                "payload = CASE WHEN attempts >= ? THEN NULL ELSE payload END, "
+                "not_before = ? + attempts * ?, error = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (self.max_attempts, self.max_attempts, self.max_attempts, now, self.retry_delay, error, task_id, worker)
+            )
+        finally:
+            connection.close()
+
+    def results(self, cycle, after=0):
+        """Tasks of a cycle that finished since after, as (finish_seq, symbol, status, result, error) tuples.
+
+        Pass the finish_seq of the last row seen to get only the newer ones.
+        """
+        connection = self._connect()
+        try:
+            return connection.execute(
+                "SELECT finish_seq, symbol, status, result, error FROM tasks "
+                "WHERE cycle = ? AND finish_seq > ? ORDER BY finish_seq",
+                (cycle, after)
+            ).fetchall()
+        finally:
+            connection.close()
+
+    def counts(self, cycle):
+        """Number of a cycle's tasks in each status"""
+        connection = self._connect()
+        try:
+            return dict(connection.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE cycle = ? GROUP BY status", (cycle,)
+            ).fetchall())
+        finally:
+            connection.close()
+
+    def purge(self, max_age_seconds):
+        """Delete tasks published more than max_age_seconds ago"""
+        connection = self._connect()
+        try:
+            connection.execute("DELETE FROM tasks WHERE created < ?", (time.time() - max_age_seconds,))
+        finally:
+            connection.close()
+
+
+# Broker implementations by URL scheme
+BROKER_BACKENDS = {
+    'sqlite': SQLiteTaskBroker
+}
+
+
+def open_broker(url, **options):
+    """Broker for a URL like sqlite:///analysis_tasks.db"""
+    parsed = urlparse(url)
+    if parsed.scheme not in BROKER_BACKENDS:
+        raise ValueError(f"Unsupported broker: {url}")
+    location = parsed.netloc + parsed.path
+    if parsed.scheme == 'sqlite' and location.startswith('/'):
+        # sqlite:///relative.db like SQLAlchemy, sqlite:////absolute/path.db for absolute paths
+        location = location[1:]
+    return BROKER_BACKENDS[parsed.scheme](location, **options)
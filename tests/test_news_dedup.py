@@ -0,0 +1,79 @@
+from news_dedup import HeadlineDeduplicator, NewsDeduplicator, headline_words
+
+
+def seen_as_copy(first, second, **options):
+    deduplicator = HeadlineDeduplicator(**options)
+    assert not deduplicator.is_duplicate(first)
+    return deduplicator.is_duplicate(second)
+
+
+def test_reworded_headline_is_a_copy():
+    assert seen_as_copy("Trump says US will build strategic bitcoin reserve",
+                        "Trump: US to build strategic Bitcoin reserve")
+    assert seen_as_copy("Bitcoin falls below $60,000 - Reuters", "Bitcoin falls below $60,000 | CoinDesk")
+
+
+def test_opposite_directions_are_different_stories():
+    assert not seen_as_copy("Bitcoin hits new all-time high", "Bitcoin hits new all-time low")
+    assert not seen_as_copy("SEC approves spot bitcoin ETF", "SEC rejects spot bitcoin ETF")
+
+
+def test_different_numbers_are_different_stories():
+    assert not seen_as_copy("Bitcoin price hits $70,000", "Bitcoin price hits $80,000")
+    assert not seen_as_copy("XRP jumps 10% on ETF hopes", "XRP jumps 20% on ETF hopes")
+
+
+def test_same_amount_written_differently_is_a_copy():
+    assert headline_words("$1 billion inflows") == headline_words("$1bn inflow") == headline_words("$1,000,000,000 inflows")
+    assert seen_as_copy("BlackRock's bitcoin ETF sees record $1 billion inflows",
+                        "BlackRock bitcoin ETF sees record $1bn inflow")
+
+
+def test_different_assets_are_different_stories():
+    assert not seen_as_copy("SEC delays spot Bitcoin ETF decision", "SEC delays spot Ether ETF decision")
+    assert not seen_as_copy("BlackRock files for Ethereum ETF", "BlackRock files for Solana ETF")
+    assert not seen_as_copy("XRP whale moves 100M XRP to Binance", "HBAR whale moves 100M HBAR to Binance")
+    assert not seen_as_copy("BlackRock files for Solana ETF", "Fidelity files for Solana ETF")
+
+
+def test_ticker_and_name_of_one_asset_are_a_copy():
+    assert seen_as_copy("Hedera HBAR jumps 20% after ETF filing", "HBAR jumps 20% after Hedera ETF filing")
+    assert seen_as_copy("Bitcoin ETF approved", "Bitcoin (BTC) ETF approved")
+
+
+def test_headlines_expire():
+    deduplicator = HeadlineDeduplicator(max_age=3600)
+    assert not deduplicator.is_duplicate("Bitcoin falls below $60,000", now=0)
+    assert deduplicator.is_duplicate("Bitcoin falls below $60,000", now=3000)
+    assert not deduplicator.is_duplicate("Bitcoin falls below $60,000", now=3700)
+
+
+def test_recurring_headline_is_not_kept_forever():
+    deduplicator = HeadlineDeduplicator(max_age=3600)
+    deduplicator.is_duplicate("Bitcoin falls below $60,000", now=0)
+    for now in range(600, 3600, 600):
+        assert deduplicator.is_duplicate("Bitcoin falls below $60,000", now=now)
+    # Seen every ten minutes, but first seen more than max_age ago
+    assert not deduplicator.is_duplicate("Bitcoin falls below $60,000", now=3700)
+    assert len(deduplicator.headlines) == 1
+
+
+def test_short_opposite_stories_are_scored_separately():
+    deduplicator = NewsDeduplicator()
+    scored = []
+
+    def scorer(text):
+        scored.append(text)
+        return len(scored)
+
+    texts = ["Bitcoin hits new all-time high", "Bitcoin hits new all-time low",
+             "Bitcoin price hits $70,000", "Bitcoin price hits $80,000"]
+    assert deduplicator.score_clusters(texts, scorer) == [1, 2, 3, 4]
+    assert scored == texts
+
+
+def test_copies_are_scored_once():
+    deduplicator = NewsDeduplicator()
+    text = "Bitcoin ETF sees record inflows as institutions pile in. Spot funds took in $1bn on Monday."
+    assert deduplicator.score_clusters([text, text + '!'], lambda _: 0.7) == [0.7]
+    assert deduplicator.score_clusters([text], lambda _: 0.1) == [0.7]
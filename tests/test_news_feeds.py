@@ -0,0 +1,78 @@
+import time
+from news_feeds import FeedReader
+
+FEED_URL = 'https://example.com/rss'
+
+
+def rss(*items):
+    """RSS document listing (guid, title, pubDate) items in the order given, newest first"""
+    entries = ''.join(
+        f"<item><guid>{guid}</guid><title>{title}</title><pubDate>{published}</pubDate></item>"
+        for guid, title, published in items
+    )
+    return f"<?xml version='1.0'?><rss><channel>{entries}</channel></rss>".encode()
+
+
+def rfc822(timestamp):
+    return time.strftime('%a, %d %b %Y %H:%M:%S +0000', time.gmtime(timestamp))
+
+
+def read(reader, document, chunk_size=64):
+    """Read a document the way the bot does: in chunks, stopping at the first seen item"""
+    stream = reader.open(FEED_URL)
+    items = []
+    for start in range(0, len(document), chunk_size):
+        items.extend(stream.feed(document[start:start + chunk_size]))
+        if stream.reached_seen:
+            return [item['title'] for item in items]
+    items.extend(stream.close())
+    return [item['title'] for item in items]
+
+
+def test_first_fetch_seeds_without_returning_items():
+    reader = FeedReader()
+    now = time.time()
+    first = [('1', 'Old story', rfc822(now - 600)), ('2', 'Older story', rfc822(now - 1200))]
+    assert read(reader, rss(*first)) == []
+    assert read(reader, rss(('3', 'Breaking story', rfc822(now)), *first)) == ['Breaking story']
+
+
+def test_future_dated_item_does_not_hide_later_items():
+    reader = FeedReader()
+    now = time.time()
+    read(reader, rss(('1', 'Old story', rfc822(now - 600))))
+
+    future = ('2', 'Story dated 2099', 'Thu, 01 Jan 2099 00:00:00 +0000')
+    assert read(reader, rss(future, ('1', 'Old story', rfc822(now - 600)))) == ['Story dated 2099']
+    assert read(reader, rss(future, ('3', 'Later story', rfc822(now)), ('1', 'Old story', rfc822(now - 600)))) == \
+        ['Later story']
+
+
+def test_restored_cursor_keeps_reading_after_a_future_dated_item():
+    reader = FeedReader()
+    now = time.time()
+    read(reader, rss(('1', 'Story dated 2099', 'Thu, 01 Jan 2099 00:00:00 +0000')))
+
+    # What the runtime snapshot saves and restores
+    restored = FeedReader()
+    cursor = reader.cursors[FEED_URL]
+    restored.cursors[FEED_URL] = {'seeded': cursor['seeded'], 'guids': type(cursor['guids'])(list(cursor['guids'].items()))}
+    assert read(restored, rss(('2', 'Later story', rfc822(now)), ('1', 'Story dated 2099', 'Thu, 01 Jan 2099 00:00:00 +0000'))) == \
+        ['Later story']
+
+
+def test_items_older_than_max_age_are_skipped():
+    reader = FeedReader(max_age_seconds=3600)
+    now = time.time()
+    read(reader, rss())
+    assert read(reader, rss(('1', 'New story', rfc822(now)), ('2', 'Stale story', rfc822(now - 7200)))) == ['New story']
+
+
+def test_interrupted_first_fetch_seeds_again():
+    reader = FeedReader()
+    now = time.time()
+    stream = reader.open(FEED_URL)
+    stream.feed(rss(('1', 'Old story', rfc822(now - 600)))[:80])  # Download fails part way
+    assert not reader.cursors[FEED_URL]['seeded']
+    assert read(reader, rss(('1', 'Old story', rfc822(now - 600)))) == []
+    assert reader.cursors[FEED_URL]['seeded']
@@ -0,0 +1,74 @@
+import sqlite3
+import time
+from datetime import datetime
+from signal_journal import SignalJournal
+
+
+def make_signal(confidence=0.5, recommendation='HOLD'):
+    return {
+        'timestamp': datetime(2026, 1, 1, 12),
+        'recommendation': recommendation,
+        'confidence': confidence,
+        'current_price': 100.0,
+        'analysis': {
+            'technical': {'confidence': 0.5, 'signal': 0.1, 'indicators': {'rsi': 50.0}},
+            'sentiment': {'confidence': 0.5, 'components': {'news_sentiment': 0.5, 'tweet_sentiment': 0.5}}
+        }
+    }
+
+
+def stored_symbols(path):
+    connection = sqlite3.connect(path)
+    try:
+        return [row[0] for row in connection.execute("SELECT symbol FROM signals ORDER BY id")]
+    finally:
+        connection.close()
+
+
+def test_signals_are_written_on_flush(tmp_path):
+    path = str(tmp_path / 'signals.db')
+    journal = SignalJournal(path)
+    journal.record('BTCUSDT', make_signal())
+    journal.record('XRPUSDT', make_signal())
+    journal.close()
+    assert stored_symbols(path) == ['BTCUSDT', 'XRPUSDT']
+
+
+def test_bad_row_does_not_lose_the_batch(tmp_path):
+    path = str(tmp_path / 'signals.db')
+    journal = SignalJournal(path)
+    journal.record('BTCUSDT', make_signal())
+    journal.record('XRPUSDT', make_signal(recommendation=None))  # Violates NOT NULL
+    journal.record('HBARUSDT', make_signal())
+    journal.close()
+    assert stored_symbols(path) == ['BTCUSDT', 'HBARUSDT']
+
+
+def test_signals_are_kept_until_the_database_can_be_opened(tmp_path, capsys):
+    path = tmp_path / 'missing' / 'signals.db'
+    journal = SignalJournal(str(path), retry_delay=0)
+    journal.record('BTCUSDT', make_signal())
+    journal.flush()
+    output = ''
+    deadline = time.monotonic() + 5
+    while 'keeping 1 signals' not in output and time.monotonic() < deadline:
+        time.sleep(0.01)
+        output += capsys.readouterr().out
+    assert 'keeping 1 signals' in output
+    journal.record('XRPUSDT', make_signal())
+    path.parent.mkdir()
+    journal.close()
+    assert stored_symbols(str(path)) == ['BTCUSDT', 'XRPUSDT']
+    assert journal.error is None
+
+
+def test_queue_is_bounded(tmp_path):
+    path = tmp_path / 'missing' / 'signals.db'
+    journal = SignalJournal(str(path), max_batch=2, max_pending=3, retry_delay=3600)
+    for number in range(10):
+        journal.record(f"SYM{number}", make_signal())
+    path.parent.mkdir()
+    journal.close()
+    stored = stored_symbols(str(path))
+    assert len(stored) <= 3
+    assert journal.dropped == 10 - len(stored)
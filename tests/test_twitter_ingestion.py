@@ -0,0 +1,100 @@
+from twitter_ingestion import TweetIngestor
+
+
+class StaticTwitterClient:
+    """Stand-in for tweepy.API that serves tweets from memory and honours since_id"""
+
+    class Tweet:
+        def __init__(self, tweet_id, full_text):
+            self.id = tweet_id
+            self.full_text = full_text
+
+    def __init__(self):
+        self.tweets = {}  # query -> list of Tweet
+        self.calls = []
+        self.next_id = 1
+
+    def add_tweets(self, query, *texts):
+        for text in texts:
+            self.tweets.setdefault(query, []).append(self.Tweet(self.next_id, text))
+            self.next_id += 1
+
+    def search_tweets(self, q, lang='en', count=100, tweet_mode='extended', since_id=None):
+        self.calls.append({'q': q, 'since_id': since_id})
+        tweets = [tweet for tweet in self.tweets.get(q, []) if since_id is None or tweet.id > since_id]
+        # Newest first, like the search API
+        return sorted(tweets, key=lambda tweet: tweet.id, reverse=True)[:count]
+
+
+def make_ingestor(tmp_path, client, window_size=200):
+    return TweetIngestor(client, window_size=window_size, state_file=str(tmp_path / 'twitter_state.json'))
+
+
+def texts(window):
+    return [tweet['text'] for tweet in window]
+
+
+def test_since_id_advances(tmp_path):
+    client = StaticTwitterClient()
+    ingestor = make_ingestor(tmp_path, client)
+    client.add_tweets('#BTC', 'one', 'two')
+
+    assert texts(ingestor.get_tweets('#BTC')) == ['one', 'two']
+    assert client.calls[-1]['since_id'] is None
+    assert ingestor.since_ids['#BTC'] == 2
+
+    client.add_tweets('#BTC', 'three')
+    assert texts(ingestor.get_tweets('#BTC')) == ['one', 'two', 'three']
+    assert client.calls[-1]['since_id'] == 2
+    assert ingestor.since_ids['#BTC'] == 3
+
+    # Nothing new: the cursor stays and nothing is added twice
+    assert texts(ingestor.get_tweets('#BTC')) == ['one', 'two', 'three']
+    assert client.calls[-1]['since_id'] == 3
+
+
+def test_queries_have_their_own_cursor(tmp_path):
+    client = StaticTwitterClient()
+    ingestor = make_ingestor(tmp_path, client)
+    client.add_tweets('#BTC', 'btc one')
+    client.add_tweets('#XRP', 'xrp one')
+
+    ingestor.get_tweets('#BTC')
+    assert texts(ingestor.get_tweets('#XRP')) == ['xrp one']
+    assert client.calls[-1]['since_id'] is None
+
+
+def test_window_keeps_only_the_newest_tweets(tmp_path):
+    client = StaticTwitterClient()
+    ingestor = make_ingestor(tmp_path, client, window_size=3)
+    client.add_tweets('#BTC', 'one', 'two')
+    ingestor.get_tweets('#BTC')
+    client.add_tweets('#BTC', 'three', 'four', 'five')
+
+    assert texts(ingestor.get_tweets('#BTC')) == ['three', 'four', 'five']
+
+
+def test_state_is_reloaded_after_a_restart(tmp_path):
+    client = StaticTwitterClient()
+    ingestor = make_ingestor(tmp_path, client, window_size=3)
+    client.add_tweets('#BTC', 'one', 'two')
+    window = ingestor.get_tweets('#BTC')
+    window[0]['sentiment'] = 0.8  # Scored in place by the analyzer
+    client.add_tweets('#BTC', 'three')
+    ingestor.get_tweets('#BTC')
+
+    restarted = make_ingestor(tmp_path, client, window_size=3)
+    assert restarted.since_ids == {'#BTC': 3}
+    assert texts(restarted.windows['#BTC']) == ['one', 'two', 'three']
+    assert restarted.windows['#BTC'][0]['sentiment'] == 0.8
+
+    client.add_tweets('#BTC', 'four')
+    assert texts(restarted.get_tweets('#BTC')) == ['two', 'three', 'four']
+    assert client.calls[-1]['since_id'] == 3
+
+
+def test_unreadable_state_starts_empty(tmp_path):
+    (tmp_path / 'twitter_state.json').write_text('{not json')
+    ingestor = make_ingestor(tmp_path, StaticTwitterClient())
+    assert ingestor.since_ids == {}
+    assert ingestor.windows == {}
@@ -0,0 +1,70 @@
+import json
+import os
+import threading
+from collections import deque
+import config
+
+
+class TweetIngestor:
+    """Fetch only tweets newer than the last seen one and keep a rolling window per query"""
+
+    def __init__(self, twitter_client, window_size=None, state_file=None):
+        self.twitter_client = twitter_client
+        self.window_size = window_size or config.TWITTER_WINDOW_SIZE
+        self.state_file = state_file or config.TWITTER_STATE_FILE
+        self.since_ids = {}  # query -> highest tweet id seen
+        self.windows = {}  # query -> deque of tweet dicts, oldest first
+        self.lock = threading.Lock()  # Queries may be fetched from several threads at once
+        self._load_state()
+
+    def _load_state(self):
+        """Restore cursors and windows saved by a previous run"""
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            self.since_ids = {query: int(since_id) for query, since_id in state.get('since_ids', {}).items()}
+            for query, tweets in state.get('windows', {}).items():
+                self.windows[query] = deque(tweets, maxlen=self.window_size)
+        except Exception as e:
+            print(f"Could not load Twitter state: {str(e)}")
+
+    def _save_state(self):
+        """Write cursors and windows to disk, replacing the old file atomically"""
+        state = {
+            'since_ids': self.since_ids,
+            'windows': {query: list(tweets) for query, tweets in self.windows.items()}
+        }
+        tmp_file = f"{self.state_file}.tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"Could not save Twitter state: {str(e)}")
+
+    def get_tweets(self, query):
+        """Fetch new tweets for a query and return the rolling window, oldest first.
+
+        Each tweet is a dict with 'id', 'text' and 'sentiment'. The sentiment starts
+        as None and is filled in by the analyzer, so a tweet is only scored once.
+        """
+        window = self.windows.setdefault(query, deque(maxlen=self.window_size))
+
+        params = {'q': query, 'lang': 'en', 'count': 100, 'tweet_mode': 'extended'}
+        if query in self.since_ids:
+            params['since_id'] = self.since_ids[query]
+        tweets = self.twitter_client.search_tweets(**params)
+
+        with self.lock:
+            new_tweets = sorted(tweets, key=lambda tweet: tweet.id)
+            for tweet in new_tweets:
+                if tweet.id <= self.since_ids.get(query, 0):
+                    continue
+                window.append({'id': tweet.id, 'text': tweet.full_text, 'sentiment': None})
+                self.since_ids[query] = tweet.id
+
+            if new_tweets:
+                self._save_state()
+            return list(window)